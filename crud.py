@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import json
+
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 
 import models
 import schemas
 import security
+from scraping import execucao
 
 # --- Funções CRUD para Usuário ---
 def get_user(db: Session, username: str):
@@ -38,7 +41,17 @@ def create_analise(db: Session, url: str, user_id: int):
     return db_analise
 
 def create_resultado_analise(db: Session, analise_id: int, criterio_id: int, resultado: Dict[str, Any]):
-    db_resultado = models.ResultadoAnalise(analise_id=analise_id, criterio_id=criterio_id, passou=resultado.get("disponibilidade"), detalhes=resultado.get("justificativa"))
+    paginas_entrada = resultado.get("paginas_entrada")
+    db_resultado = models.ResultadoAnalise(
+        analise_id=analise_id, criterio_id=criterio_id,
+        passou=resultado.get("disponibilidade"), detalhes=resultado.get("justificativa"), pontuacao=resultado.get("pontuacao"),
+        versao_criterio=resultado.get("versao_criterio"),
+        paginas_entrada=json.dumps(paginas_entrada) if paginas_entrada else None,
+        resultado_completo=json.dumps(
+            {campo: valor for campo, valor in resultado.items() if campo not in execucao.CAMPOS_INCREMENTAIS},
+            ensure_ascii=False, default=str,
+        ),
+    )
     db.add(db_resultado)
     db.commit()
     db.refresh(db_resultado)
@@ -55,6 +68,32 @@ def salvar_resultado_completo_analise(db: Session, resultado_json: Dict[str, Any
             create_resultado_analise(db=db, analise_id=analise.id, criterio_id=criterio_db.id, resultado=criterio_data)
     return analise
 
+def get_resultados_anteriores(db: Session, url: str, user_id: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Resultados da análise mais recente da URL feita pelo usuário, {codigo: dados}, no formato
+    esperado pela reavaliação incremental do scraping (ver `scraping.execucao.executar`).
+    Resultados editados à mão ficam de fora. Vazio se o usuário nunca analisou a URL.
+    """
+    analise = (
+        db.query(models.Analise)
+        .filter(models.Analise.url_avaliada == url, models.Analise.user_id == user_id)
+        .order_by(models.Analise.data_analise.desc())
+        .first()
+    )
+    if analise is None:
+        return {}
+    anteriores = {}
+    for resultado in analise.resultados:
+        if not resultado.versao_criterio or not resultado.paginas_entrada or not resultado.resultado_completo:
+            continue
+        anteriores[resultado.criterio.codigo] = {
+            "resultado": json.loads(resultado.resultado_completo),
+            "versao_criterio": resultado.versao_criterio,
+            "paginas_entrada": json.loads(resultado.paginas_entrada),
+            "data_analise": analise.data_analise,
+        }
+    return anteriores
+
 def get_analises_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100):
     return db.query(models.Analise).filter(models.Analise.user_id == user_id).order_by(models.Analise.data_analise.desc()).offset(skip).limit(limit).all()
 
@@ -77,6 +116,10 @@ def update_resultado_analise(db: Session, resultado_id: int, resultado_update: s
             db_resultado.passou = resultado_update.passou
         if resultado_update.detalhes is not None:
             db_resultado.detalhes = resultado_update.detalhes
+        # Resultado editado à mão: não é mais reaproveitado pela reavaliação incremental
+        db_resultado.versao_criterio = None
+        db_resultado.paginas_entrada = None
+        db_resultado.resultado_completo = None
         
         db.commit()
         db.refresh(db_resultado)
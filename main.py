@@ -3,12 +3,16 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import json
+import queue
 import sys
+import threading
 from pathlib import Path
 from typing import Dict, Any, List
 from datetime import timedelta
 
 from fastapi import FastAPI, HTTPException, Depends, status, Query, Body
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -21,15 +25,18 @@ import schemas
 from schemas import LoginRequest
 from schemas import AnaliseRequest
 import security
-from database import engine, get_db
+from database import SessionLocal, engine, get_db
 
-from scraping import scraper
+from scraping import contexto, execucao, memoria, scraper
 import requests
 from bs4 import BeautifulSoup
 from fastapi.middleware.cors import CORSMiddleware
 
 models.Base.metadata.create_all(bind=engine)
 
+# Catálogo de critérios montado uma única vez: um manager inválido impede a subida da API
+catalogo = scraper.preparar()
+
 # --- 2. INSTÂNCIA DA API ---
 app = FastAPI(
     title="SAPT - API de Análise de Transparência (com CRUD completo)",
@@ -38,16 +45,72 @@ app = FastAPI(
 )
 
 # --- 3. LÓGICA DE NEGÓCIO (SCRAPING) ---
-def executar_analise_completa(url: str) -> Dict[str, Any]:
+def executar_analise_completa(url: str, prazo: float = None, anteriores: Dict[str, Any] = None, ao_avaliar=None) -> Dict[str, Any]:
     try:
-        return scraper.executar_scraping(url)
+        return scraper.executar_scraping(url, prazo=prazo, anteriores=anteriores, ao_avaliar=ao_avaliar)
     except requests.RequestException as e:
         raise HTTPException(status_code=400, detail=f"Falha ao carregar a URL: {e}")
+    except memoria.MemoriaExcedida as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except contexto.PrazoEsgotado as e:
+        # Nem a página inicial chegou dentro do prazo: não há o que avaliar
+        raise HTTPException(status_code=504, detail=f"Prazo da análise esgotado: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro durante a execução da análise: {e}")
 
+# --- Análise com resultados em tempo real (SSE) ---
+INTERVALO_PING = 15  # segundos sem eventos até um comentário de keep-alive (proxies encerram conexões ociosas)
+
+def _evento(nome: str, dados: Dict[str, Any]) -> str:
+    return f"event: {nome}\ndata: {json.dumps(dados, ensure_ascii=False, default=str)}\n\n"
+
+def _evento_criterio(dominio: str, resultado: Dict[str, Any]) -> Dict[str, Any]:
+    """Resultado de um critério como enviado ao cliente, sem os campos internos da análise incremental."""
+    dados = {chave: valor for chave, valor in resultado.items() if chave not in execucao.CAMPOS_INCREMENTAIS}
+    return {"dominio": dominio, **dados}
+
+def _analisar_e_salvar(analise_request: AnaliseRequest, user: models.User, anteriores, eventos: queue.Queue):
+    """Executa e persiste a análise numa thread própria, publicando os eventos na fila."""
+    try:
+        resultado_json = executar_analise_completa(
+            analise_request.url, analise_request.prazo, anteriores,
+            ao_avaliar=lambda dominio, resultado: eventos.put(("criterio", _evento_criterio(dominio, resultado))),
+        )
+        # Sessão própria: a da requisição pode ser fechada antes do fim da resposta
+        db = SessionLocal()
+        try:
+            analise_salva = crud.salvar_resultado_completo_analise(db=db, resultado_json=resultado_json, user=user)
+            eventos.put(("analise", {"id": analise_salva.id, "dominios": list(resultado_json["dominios"]), "metricas": resultado_json.get("metricas")}))
+        finally:
+            db.close()
+    except HTTPException as e:
+        eventos.put(("erro", {"status": e.status_code, "detail": e.detail}))
+    except Exception as e:
+        eventos.put(("erro", {"status": 500, "detail": f"Ocorreu um erro interno inesperado: {e}"}))
+    finally:
+        eventos.put(None)
+
+def _transmitir_analise(analise_request: AnaliseRequest, user: models.User, anteriores):
+    eventos = queue.Queue()
+    # A análise segue (e é salva) mesmo que o cliente desconecte
+    threading.Thread(target=_analisar_e_salvar, args=(analise_request, user, anteriores, eventos), daemon=True).start()
+    while True:
+        try:
+            evento = eventos.get(timeout=INTERVALO_PING)
+        except queue.Empty:
+            yield ": ping\n\n"
+            continue
+        if evento is None:
+            return
+        yield _evento(*evento)
+
 # --- 4. ENDPOINTS DA API ---
 
+@app.get("/pronto")
+def verificar_prontidao():
+    """Prontidão: o catálogo de critérios foi montado e validado na inicialização."""
+    return {"status": "pronto", "dominios": list(catalogo.dominios), "criterios": len(catalogo.criterios)}
+
 @app.post("/login", response_model=schemas.Token)
 async def login_for_access_token(
     login_data: LoginRequest = Body(...),
@@ -84,7 +147,8 @@ async def analisar_e_salvar_portal(
     db: Session = Depends(get_db)
 ):
     try:
-        resultado_json = executar_analise_completa(analise_request.url)
+        anteriores = crud.get_resultados_anteriores(db, analise_request.url, current_user.id) if analise_request.incremental else None
+        resultado_json = executar_analise_completa(analise_request.url, analise_request.prazo, anteriores)
         analise_salva = crud.salvar_resultado_completo_analise(db=db, resultado_json=resultado_json, user=current_user)
         return analise_salva
     except HTTPException as e:
@@ -92,6 +156,24 @@ async def analisar_e_salvar_portal(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ocorreu um erro interno inesperado: {e}")
 
+@app.post("/api/analise/stream")
+def analisar_e_salvar_portal_em_tempo_real(
+    analise_request: AnaliseRequest,
+    current_user: models.User = Depends(security.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Como `POST /api/analise`, mas responde em Server-Sent Events: um evento `criterio`
+    para cada critério assim que é avaliado (com o campo `dominio`), e ao final um
+    evento `analise` com o `id` da análise salva, ou `erro` com `status` e `detail`.
+    """
+    anteriores = crud.get_resultados_anteriores(db, analise_request.url, current_user.id) if analise_request.incremental else None
+    return StreamingResponse(
+        _transmitir_analise(analise_request, current_user, anteriores),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/api/analises/", response_model=List[schemas.Analise])
 def ler_historico_de_analises(
     skip: int = 0, 
@@ -67,6 +67,13 @@ class ResultadoAnalise(Base):
     passou = Column(Boolean, nullable=True) # Usamos nullable para casos onde não se aplica
     detalhes = Column(Text, nullable=True)
     pontuacao = Column(Float, nullable=True)
+    # Reavaliação incremental: versão do critério, [[url, hash], ...] das páginas lidas e o
+    # resultado completo do critério (JSON), copiado para a análise seguinte se nada mudou.
+    # Ficam vazios quando o resultado é editado à mão. O create_all não altera tabelas
+    # existentes: ver a migração no README
+    versao_criterio = Column(String(64), nullable=True)
+    paginas_entrada = Column(Text, nullable=True)
+    resultado_completo = Column(Text, nullable=True)
 
     analise_id = Column(Integer, ForeignKey("analises.id"))
     criterio_id = Column(Integer, ForeignKey("criterios.id"))
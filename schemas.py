@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Union, List, Optional
 from datetime import datetime
 
@@ -51,6 +51,12 @@ class Criterio(CriterioBase):
 # --- Schemas para Resultado da Análise ---
 class AnaliseRequest(BaseModel):
     url: str
+    # Prazo da análise em segundos; sem valor, usa SCRAPING_PRAZO_ANALISE.
+    # Critérios que não couberem no prazo voltam marcados como não avaliados.
+    prazo: Optional[float] = Field(default=None, gt=0, le=600)
+    # Reaproveita os resultados da última análise da URL cujos critérios e páginas
+    # não mudaram; False reavalia todos os critérios.
+    incremental: bool = True
     
 class ResultadoAnaliseBase(BaseModel):
     passou: Optional[bool] = None
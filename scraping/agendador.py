@@ -0,0 +1,186 @@
+"""
+Agendador de requisições por host (politeness).
+
+Em auditorias em lote, muitas análises simultâneas acessam os mesmos hosts de
+fornecedores (ex.: governotransparente.com.br), que passam a limitar ou bloquear
+os acessos. Antes de cada download, o fetcher reserva uma vaga no host de destino:
+
+- um token bucket por host limita a taxa de requisições (com rajada configurável);
+- um limite de conexões simultâneas por host;
+- os pedidos em espera são atendidos em rodízio entre as análises, para que uma
+  análise com muitas páginas no mesmo host não monopolize a fila.
+
+Como cada host tem sua própria fila, a vazão total cresce com o número de hosts
+distintos em vez de cair nos hosts compartilhados. O estado de um host sem
+pedidos na fila nem downloads em andamento é descartado depois de um tempo
+ocioso; ao voltar, o host recomeça com a rajada cheia, como já teria após a espera.
+
+Configuração (variáveis de ambiente; 0 desativa o respectivo limite):
+- SCRAPING_HOST_REQ_POR_SEGUNDO: requisições por segundo por host (padrão 5)
+- SCRAPING_HOST_RAJADA: requisições permitidas em rajada por host (padrão 5)
+- SCRAPING_HOST_MAX_CONEXOES: downloads simultâneos por host (padrão 6, como nos navegadores)
+- SCRAPING_HOST_OCIOSO_S: segundos sem uso até o estado do host ser descartado (padrão 60)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from scraping import contexto
+
+REQ_POR_SEGUNDO = float(os.getenv("SCRAPING_HOST_REQ_POR_SEGUNDO", 5))
+RAJADA = float(os.getenv("SCRAPING_HOST_RAJADA", 5))
+MAX_CONEXOES = int(os.getenv("SCRAPING_HOST_MAX_CONEXOES", 6))
+OCIOSO_S = float(os.getenv("SCRAPING_HOST_OCIOSO_S", 60))
+
+class Cancelado(Exception):
+    """O pedido foi cancelado (ver `reservar(cancelado=...)`) antes de obter a vaga."""
+
+class _Host:
+    """Estado de agendamento de um host: tokens, conexões em uso e fila por análise."""
+
+    def __init__(self):
+        self.condicao = threading.Condition()
+        self.tokens = RAJADA
+        self.atualizado_em = time.monotonic()
+        self.em_uso = 0
+        self.filas = OrderedDict()  # análise -> deque de pedidos, em ordem de rodízio
+        # Pedidos na fila ou em andamento (protegido por _lock_hosts) e fim do último
+        self.referencias = 0
+        self.liberado_em = time.monotonic()
+
+    def enfileirar(self, dono, pedido):
+        self.filas.setdefault(dono, deque()).append(pedido)
+
+    def proximo(self):
+        if not self.filas:
+            return None
+        return self.filas[next(iter(self.filas))][0]
+
+    def atender(self):
+        """Retira o pedido da vez e manda a análise dele para o fim do rodízio."""
+        dono = next(iter(self.filas))
+        fila = self.filas.pop(dono)
+        fila.popleft()
+        if fila:
+            self.filas[dono] = fila
+
+    def remover(self, dono, pedido):
+        fila = self.filas.get(dono)
+        if fila is not None and pedido in fila:
+            fila.remove(pedido)
+            if not fila:
+                del self.filas[dono]
+
+    def consumir_token(self):
+        """Consome um token; retorna 0 ou os segundos até o próximo token."""
+        if REQ_POR_SEGUNDO <= 0:
+            return 0
+        agora = time.monotonic()
+        self.tokens = min(max(RAJADA, 1), self.tokens + (agora - self.atualizado_em) * REQ_POR_SEGUNDO)
+        self.atualizado_em = agora
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / REQ_POR_SEGUNDO
+
+_hosts = {}
+_lock_hosts = threading.Lock()
+_proxima_limpeza = 0.0
+
+def _nome_host(url):
+    return (urlsplit(url).hostname or "").lower()
+
+def _limpar_ociosos(agora):
+    """Descarta os hosts sem pedidos há mais de OCIOSO_S (chamada com _lock_hosts)."""
+    global _proxima_limpeza
+    if agora < _proxima_limpeza:
+        return
+    _proxima_limpeza = agora + OCIOSO_S
+    for host in [host for host, estado in _hosts.items()
+                 if estado.referencias == 0 and agora - estado.liberado_em >= OCIOSO_S]:
+        del _hosts[host]
+
+def _estado_host(url):
+    """Estado do host da URL, mantido enquanto o pedido não chamar `_soltar`."""
+    host = _nome_host(url)
+    with _lock_hosts:
+        _limpar_ociosos(time.monotonic())
+        if host not in _hosts:
+            _hosts[host] = _Host()
+        estado = _hosts[host]
+        estado.referencias += 1
+        return estado
+
+def _soltar(estado):
+    with _lock_hosts:
+        estado.referencias -= 1
+        estado.liberado_em = time.monotonic()
+
+def despertar(url):
+    """Faz os pedidos em espera no host da URL conferirem se foram cancelados."""
+    with _lock_hosts:
+        estado = _hosts.get(_nome_host(url))
+    if estado is not None:
+        with estado.condicao:
+            estado.condicao.notify_all()
+
+@contextmanager
+def reservar(url, cancelado=None):
+    """
+    Aguarda a vez (rodízio, taxa e conexões) no host da URL durante o bloco `with`.
+    Se o evento `cancelado` for marcado (seguido de `despertar(url)`) antes da vez
+    chegar, levanta `Cancelado` sem consumir token nem conexão.
+    """
+    estado = _estado_host(url)
+    try:
+        with _vaga(estado, url, cancelado):
+            yield
+    finally:
+        _soltar(estado)
+
+@contextmanager
+def _vaga(estado, url, cancelado):
+    analise = contexto.atual()
+    dono = id(analise) if analise is not None else None
+    pedido = object()
+    inicio = time.monotonic()
+
+    with estado.condicao:
+        estado.enfileirar(dono, pedido)
+        try:
+            while True:
+                if cancelado is not None and cancelado.is_set():
+                    raise Cancelado(f"Pedido a {url} cancelado.")
+                espera = None
+                if estado.proximo() is pedido and (MAX_CONEXOES <= 0 or estado.em_uso < MAX_CONEXOES):
+                    espera = estado.consumir_token()
+                    if espera == 0:
+                        estado.atender()
+                        estado.em_uso += 1
+                        estado.condicao.notify_all()
+                        break
+                tempo = contexto.restante()
+                if tempo is not None:
+                    if tempo <= 0:
+                        raise contexto.PrazoEsgotado(f"Prazo esgotado aguardando vaga em {url}.")
+                    espera = tempo if espera is None else min(espera, tempo)
+                estado.condicao.wait(espera)
+        except BaseException:
+            # Não deixa um pedido abandonado bloqueando a fila do host
+            estado.remover(dono, pedido)
+            estado.condicao.notify_all()
+            raise
+
+    aguardado = time.monotonic() - inicio
+    if aguardado >= 0.001:
+        contexto.contar("agendador_espera_ms", int(aguardado * 1000))
+    try:
+        yield
+    finally:
+        with estado.condicao:
+            estado.em_uso -= 1
+            estado.condicao.notify_all()
@@ -0,0 +1,126 @@
+"""
+Antecipação das subpáginas durante o download da página inicial.
+
+Sem antecipação, as subpáginas só começam a ser baixadas depois que a página
+inicial chegou inteira, foi analisada e os managers localizaram seus links. Aqui
+o corpo da página inicial é lido à medida que os blocos chegam: um tokenizador
+incremental (`html.parser`) extrai as âncoras e cada uma é classificada nos grupos
+registrados em `scraping.descoberta`. Na primeira âncora de cada grupo, o download
+da subpágina começa em segundo plano pelo registro de páginas da análise, que o
+manager depois reaproveita em vez de baixar de novo.
+
+A escolha definitiva do link de cada grupo continua sendo a de `descoberta`, sobre
+a página completa: se ela divergir da antecipada, o único custo é um download a
+mais, e o resultado da análise não muda.
+
+Os downloads antecipados de todas as análises do processo dividem um único pool
+de threads. Os que ainda não começaram quando a análise termina são cancelados.
+
+Configuração:
+- SCRAPING_ANTECIPAR: "0" desativa a antecipação (padrão "1")
+- SCRAPING_ANTECIPAR_THREADS: downloads antecipados simultâneos no processo (padrão 8)
+"""
+
+import codecs
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from scraping import contexto, decodificacao, descoberta, paginas
+
+ANTECIPAR = os.getenv("SCRAPING_ANTECIPAR", "1") != "0"
+ANTECIPAR_THREADS = int(os.getenv("SCRAPING_ANTECIPAR_THREADS", 8))
+
+_executor = ThreadPoolExecutor(max_workers=max(ANTECIPAR_THREADS, 1), thread_name_prefix="antecipacao")
+
+class _LeitorLinks(HTMLParser):
+    """Tokenizador incremental que entrega (href, textos) de cada âncora ao fechá-la."""
+
+    def __init__(self, ao_encontrar):
+        super().__init__(convert_charrefs=True)
+        self._ao_encontrar = ao_encontrar
+        self._href = None
+        self._textos = None
+        self._ignorando = False
+
+    def _fechar_ancora(self):
+        if self._textos is not None:
+            self._ao_encontrar(self._href, self._textos)
+        self._href = self._textos = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._ignorando = True
+        elif tag == "a":
+            self._fechar_ancora()
+            href = dict(attrs).get("href")
+            if href is not None:
+                self._href, self._textos = href, []
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            self._ignorando = False
+        elif tag == "a":
+            self._fechar_ancora()
+
+    def handle_data(self, data):
+        if self._textos is not None and not self._ignorando:
+            texto = data.strip()
+            if texto:
+                self._textos.append(texto)
+
+class Antecipacao:
+    """Consumidor dos blocos da página inicial (ver `fetcher.baixar(ao_receber=...)`)."""
+
+    def __init__(self, url):
+        self.url = url
+        self._decodificador = None
+        self._leitor = _LeitorLinks(self._ao_encontrar)
+        self._antecipados = set()
+        self._ativo = True
+
+    def __call__(self, bloco, content_type=""):
+        if not self._ativo or not bloco:
+            return
+        try:
+            if self._decodificador is None:
+                codificacao = decodificacao.codificacao_provavel(bloco, content_type)
+                try:
+                    self._decodificador = codecs.getincrementaldecoder(codificacao)(errors="replace")
+                except LookupError:
+                    self._decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            self._leitor.feed(self._decodificador.decode(bloco))
+        except Exception as e:
+            # A antecipação é só uma otimização: nunca interrompe o download
+            self._ativo = False
+            print(f"[AVISO] Antecipação de subpáginas interrompida em {self.url}: {e}")
+
+    def _ao_encontrar(self, href, textos):
+        for grupo in descoberta.classificar(href, textos) - self._antecipados:
+            self._antecipados.add(grupo)
+            self._antecipar(urljoin(self.url, href), descoberta.timeout(grupo))
+
+    def _antecipar(self, url, timeout):
+        analise = contexto.atual()
+        if analise is None or analise.encerrada:
+            return
+        contexto.contar("subpaginas_antecipadas")
+        analise.acompanhar(_executor.submit(contextvars.copy_context().run, _carregar, url, timeout))
+
+def _carregar(url, timeout):
+    analise = contexto.atual()
+    if analise is None or analise.encerrada:
+        return
+    try:
+        paginas.carregar_pagina(url, timeout=timeout)
+    except Exception:
+        # O erro reaparece (e é tratado) quando o manager pedir a mesma página
+        pass
+
+def consumidor(url):
+    """Retorna o consumidor de blocos para a página inicial da análise, ou None se desativado."""
+    if not ANTECIPAR or contexto.atual() is None:
+        return None
+    return Antecipacao(url)
@@ -0,0 +1,187 @@
+"""
+Cache persistente de páginas do scraping.
+
+Os portais municipais são reauditados várias vezes por mês e a maior parte das
+páginas não muda entre as análises. Este módulo guarda cada resposta (corpo,
+cabeçalhos, ETag e Last-Modified) num banco SQLite compartilhado por todos os
+workers do uvicorn:
+
+- dentro do TTL a página é servida direto do cache, sem acessar a rede;
+- depois do TTL ela é revalidada com If-None-Match / If-Modified-Since, e uma
+  resposta 304 reaproveita o corpo guardado;
+- o `Cache-Control` da resposta é respeitado: `no-store` não é guardada,
+  `no-cache` é sempre revalidada e `max-age` encurta o TTL;
+- o tamanho total é limitado, removendo as entradas acessadas há mais tempo (LRU).
+
+Além disso, o processo mantém os últimos HTML decodificados indexados pelo hash
+do corpo, de modo que uma página não modificada também não é decodificada de
+novo. Cada análise recebe sua própria `Pagina` sobre esse HTML: árvores e
+características calculadas nunca são compartilhadas entre análises.
+
+Configuração (variáveis de ambiente):
+- SCRAPING_CACHE: "0" desativa o cache (padrão ativado)
+- SCRAPING_CACHE_CAMINHO: arquivo SQLite (padrão no diretório temporário do sistema)
+- SCRAPING_CACHE_TTL: segundos em que uma página é usada sem revalidar (padrão 3600)
+- SCRAPING_CACHE_MAX_MB: tamanho máximo dos corpos armazenados (padrão 200)
+- SCRAPING_CACHE_PARSES: HTML decodificados mantidos em memória por processo (padrão 16)
+"""
+
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+CACHE_HABILITADO = os.getenv("SCRAPING_CACHE", "1").lower() not in ("0", "false", "nao", "não")
+CACHE_CAMINHO = os.getenv("SCRAPING_CACHE_CAMINHO", os.path.join(tempfile.gettempdir(), "sapt_cache_paginas.sqlite3"))
+CACHE_TTL = int(os.getenv("SCRAPING_CACHE_TTL", 3600))
+CACHE_MAX_BYTES = int(os.getenv("SCRAPING_CACHE_MAX_MB", 200)) * 1024 * 1024
+CACHE_MAX_PARSES = int(os.getenv("SCRAPING_CACHE_PARSES", 16))
+
+_MAX_AGE = re.compile(r"max-age\s*=\s*\"?(\d+)")
+
+def _validade(cabecalhos) -> float:
+    """Segundos em que a resposta pode ser usada sem revalidar: CACHE_TTL, limitado pelo Cache-Control."""
+    cache_control = cabecalhos.get("cache-control", "").lower()
+    if "no-cache" in cache_control:
+        return 0
+    max_age = _MAX_AGE.search(cache_control)
+    if max_age:
+        return min(CACHE_TTL, int(max_age.group(1)))
+    return CACHE_TTL
+
+class EntradaCache(NamedTuple):
+    corpo: bytes
+    codificacao: Optional[str]
+    cabecalhos: dict
+    hash_corpo: str
+    armazenado_em: float
+
+    @property
+    def fresca(self) -> bool:
+        return time.time() - self.armazenado_em < _validade(self.cabecalhos)
+
+    def cabecalhos_condicionais(self) -> dict:
+        """Cabeçalhos para revalidar a entrada junto ao servidor."""
+        cabecalhos = {}
+        if self.cabecalhos.get("etag"):
+            cabecalhos["If-None-Match"] = self.cabecalhos["etag"]
+        if self.cabecalhos.get("last-modified"):
+            cabecalhos["If-Modified-Since"] = self.cabecalhos["last-modified"]
+        return cabecalhos
+
+# --- Banco SQLite (uma conexão por thread) ---
+_local = threading.local()
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS paginas (
+    url TEXT PRIMARY KEY,
+    corpo BLOB NOT NULL,
+    codificacao TEXT,
+    cabecalhos TEXT NOT NULL,
+    hash_corpo TEXT NOT NULL,
+    tamanho INTEGER NOT NULL,
+    armazenado_em REAL NOT NULL,
+    acessado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_paginas_acessado_em ON paginas (acessado_em);
+"""
+
+def _conexao():
+    conexao = getattr(_local, "conexao", None)
+    if conexao is None:
+        diretorio = os.path.dirname(CACHE_CAMINHO)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        conexao = sqlite3.connect(CACHE_CAMINHO, timeout=30, isolation_level=None)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.executescript(_ESQUEMA)
+        _local.conexao = conexao
+    return conexao
+
+def consultar(url) -> Optional[EntradaCache]:
+    """Retorna a entrada guardada para a URL (já normalizada), se houver."""
+    if not CACHE_HABILITADO:
+        return None
+    try:
+        conexao = _conexao()
+        linha = conexao.execute(
+            "SELECT corpo, codificacao, cabecalhos, hash_corpo, armazenado_em FROM paginas WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if linha is None:
+            return None
+        conexao.execute("UPDATE paginas SET acessado_em = ? WHERE url = ?", (time.time(), url))
+    except sqlite3.Error as e:
+        print(f"[AVISO] Falha ao consultar o cache de páginas: {e}")
+        return None
+    corpo, codificacao, cabecalhos, hash_corpo, armazenado_em = linha
+    return EntradaCache(corpo, codificacao, json.loads(cabecalhos), hash_corpo, armazenado_em)
+
+def armazenar(url, corpo: bytes, codificacao, cabecalhos, hash_corpo):
+    """Guarda (ou substitui) a resposta da URL e aplica o limite de tamanho."""
+    if not CACHE_HABILITADO:
+        return
+    if "no-store" in cabecalhos.get("cache-control", "").lower():
+        return
+    agora = time.time()
+    cabecalhos = {chave.lower(): valor for chave, valor in cabecalhos.items()}
+    try:
+        conexao = _conexao()
+        conexao.execute(
+            "INSERT OR REPLACE INTO paginas VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, corpo, codificacao, json.dumps(cabecalhos), hash_corpo, len(corpo), agora, agora),
+        )
+        _aplicar_limite(conexao)
+    except sqlite3.Error as e:
+        print(f"[AVISO] Falha ao gravar no cache de páginas: {e}")
+
+def renovar(url):
+    """Marca a entrada como revalidada (resposta 304), reiniciando o TTL."""
+    if not CACHE_HABILITADO:
+        return
+    agora = time.time()
+    try:
+        _conexao().execute("UPDATE paginas SET armazenado_em = ?, acessado_em = ? WHERE url = ?", (agora, agora, url))
+    except sqlite3.Error as e:
+        print(f"[AVISO] Falha ao renovar entrada do cache de páginas: {e}")
+
+def _aplicar_limite(conexao):
+    """Remove as entradas menos acessadas até o total caber em CACHE_MAX_BYTES."""
+    total = conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM paginas").fetchone()[0]
+    if total <= CACHE_MAX_BYTES:
+        return
+    excedente = total - CACHE_MAX_BYTES
+    removidas = []
+    for url, tamanho in conexao.execute("SELECT url, tamanho FROM paginas ORDER BY acessado_em"):
+        removidas.append((url,))
+        excedente -= tamanho
+        if excedente <= 0:
+            break
+    conexao.executemany("DELETE FROM paginas WHERE url = ?", removidas)
+
+# --- HTML decodificados recentes em memória ---
+_textos = OrderedDict()
+_lock_textos = threading.Lock()
+
+def texto_memorizado(chave, decodificar):
+    """
+    Retorna o HTML já decodificado para esta chave (hash do corpo e codificação)
+    ou executa `decodificar()` e o memoriza. Só guarda a string, que é imutável.
+    """
+    if not CACHE_HABILITADO or CACHE_MAX_PARSES <= 0:
+        return decodificar()
+    with _lock_textos:
+        if chave in _textos:
+            _textos.move_to_end(chave)
+            return _textos[chave]
+    texto = decodificar()
+    with _lock_textos:
+        _textos[chave] = texto
+        while len(_textos) > CACHE_MAX_PARSES:
+            _textos.popitem(last=False)
+    return texto
@@ -0,0 +1,46 @@
+"""
+Utilitários de execução concorrente do pipeline de scraping.
+
+As etapas do scraping passam quase todo o tempo esperando a rede, então são
+executadas em threads com um limite explícito de paralelismo.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+def mapear_em_paralelo(funcao, itens, max_paralelo):
+    """
+    Aplica `funcao` a cada item usando até `max_paralelo` threads.
+
+    Os resultados são devolvidos na mesma ordem dos itens, independentemente da
+    ordem de conclusão. Com `max_paralelo` <= 1 a execução é sequencial.
+    Cada tarefa roda numa cópia do contexto atual, preservando a análise em andamento.
+    """
+    itens = list(itens)
+    if max_paralelo <= 1 or len(itens) <= 1:
+        return [funcao(item) for item in itens]
+
+    with ThreadPoolExecutor(max_workers=min(max_paralelo, len(itens))) as executor:
+        futuros = [executor.submit(contextvars.copy_context().run, funcao, item) for item in itens]
+        return [futuro.result() for futuro in futuros]
+
+class memorizada:
+    """
+    Como `functools.cached_property`, mas a trava é a da própria instância
+    (atributo `_lock`): no Python 3.11 a trava do cached_property é única para a
+    classe inteira, o que serializaria o cálculo entre páginas diferentes.
+    Depois do primeiro cálculo o valor fica no `__dict__` e é lido sem trava.
+    """
+
+    def __init__(self, calcular):
+        self.calcular = calcular
+        self.nome = calcular.__name__
+        self.__doc__ = calcular.__doc__
+
+    def __get__(self, instancia, dono=None):
+        if instancia is None:
+            return self
+        with instancia._lock:
+            if self.nome not in instancia.__dict__:
+                instancia.__dict__[self.nome] = self.calcular(instancia)
+            return instancia.__dict__[self.nome]
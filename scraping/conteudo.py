@@ -0,0 +1,65 @@
+"""
+Separação entre o conteúdo principal de uma página e o modelo (template) do portal.
+
+As subpáginas de um portal repetem cabeçalho, menus e rodapé. Esse texto
+compartilhado é varrido por todos os critérios e provoca acertos falsos (ex.: o
+"ano" de um menu lido como filtro por ano). Para isolar o conteúdo principal,
+cada bloco estrutural da página (div, section, nav, ul, ...) recebe uma assinatura
+(hash do seu texto); os blocos cuja assinatura também aparece na página inicial
+da análise são considerados modelo e retirados do texto.
+
+A comparação é sempre feita contra a página inicial, e não contra as demais
+páginas já carregadas, para que o resultado não dependa da ordem de chegada das
+subpáginas. A própria página inicial não tem blocos retirados. Por isso o texto
+principal de uma subpágina depende também da página inicial, que é registrada
+como entrada do critério (ver `paginas.registrar_dependencia`).
+"""
+
+import hashlib
+
+from scraping import contexto
+
+BLOCOS = ("header", "nav", "footer", "aside", "div", "section", "ul", "ol", "table", "form")
+
+# Blocos com menos texto que isto não são comparados (ex.: um link "Início" solto)
+MIN_CARACTERES_BLOCO = 20
+
+def _assinatura(texto):
+    return hashlib.blake2b(texto.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+
+def _textos_blocos(pagina):
+    textos = (" ".join(elemento.stripped_strings) for elemento in pagina.soup.find_all(list(BLOCOS)))
+    return {texto for texto in textos if len(texto) >= MIN_CARACTERES_BLOCO}
+
+def _modelo(pagina_inicial):
+    """(assinaturas dos blocos da página inicial, identificador desse conjunto)."""
+    def calcular():
+        assinaturas = frozenset(_assinatura(texto) for texto in _textos_blocos(pagina_inicial))
+        return assinaturas, _assinatura("".join(sorted(a.hex() for a in assinaturas)))
+    return pagina_inicial.memorizado("conteudo_modelo", calcular)
+
+def _remover_blocos(pagina, assinaturas):
+    blocos = [texto for texto in _textos_blocos(pagina) if _assinatura(texto) in assinaturas]
+    # Os maiores primeiro: um bloco de modelo pode conter outros
+    texto = f" {pagina.texto} "
+    for bloco in sorted(blocos, key=len, reverse=True):
+        trecho = f" {bloco} "
+        while trecho in texto:
+            texto = texto.replace(trecho, " ")
+    return texto.strip()
+
+def texto_principal(pagina):
+    """Texto visível da página sem os blocos que ela compartilha com a página inicial."""
+    analise = contexto.atual()
+    inicial = getattr(analise, "pagina_inicial", None)
+    if inicial is None or inicial is pagina:
+        return pagina.texto
+
+    # Import tardio para evitar ciclo (paginas depende deste módulo)
+    from scraping import paginas
+    paginas.registrar_dependencia(inicial)
+    if inicial.html == pagina.html:
+        return pagina.texto
+
+    assinaturas, identificador = _modelo(inicial)
+    return pagina.memorizado(("texto_principal", identificador), lambda: _remover_blocos(pagina, assinaturas))
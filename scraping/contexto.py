@@ -0,0 +1,144 @@
+"""
+Contexto de uma análise em andamento.
+
+Cada chamada a `executar_scraping` abre um contexto próprio, guardado em uma
+`ContextVar`, com o estado que deve ser compartilhado entre os domínios e
+critérios daquela análise (e somente dela). As threads do pipeline herdam o
+contexto por meio de `concorrencia.mapear_em_paralelo`.
+
+O contexto também carrega o prazo da análise. Cada critério recebe ainda um
+orçamento próprio (`orcamento`). Os downloads têm o timeout reduzido ao tempo que
+resta até o prazo mais próximo (`limitar_timeout`) e levantam `PrazoEsgotado`
+quando ele termina.
+
+Configuração:
+- SCRAPING_PRAZO_ANALISE: prazo padrão de uma análise, em segundos; 0 = sem prazo (padrão 120)
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+PRAZO_PADRAO = float(os.getenv("SCRAPING_PRAZO_ANALISE", 120))
+
+_analise_atual = contextvars.ContextVar("analise_atual", default=None)
+# Instante (time.monotonic) em que termina o orçamento do critério em execução
+_limite_criterio = contextvars.ContextVar("limite_criterio", default=None)
+
+class PrazoEsgotado(TimeoutError):
+    """O prazo da análise, ou o orçamento do critério em execução, terminou."""
+
+class ContextoAnalise:
+    """Estado compartilhado pelas etapas de uma única análise."""
+
+    def __init__(self, url, prazo=None):
+        # Imports tardios para evitar ciclo (paginas e memoria dependem deste módulo)
+        from scraping import memoria
+        from scraping.paginas import RegistroPaginas
+
+        self.url = url
+        self.limite = time.monotonic() + prazo if prazo else None  # None: sem prazo
+        self.paginas = RegistroPaginas()
+        self.pagina_inicial = None  # definida pelo scraper ao carregar a URL analisada
+        self.memoria = memoria.iniciar(url)  # None se o acompanhamento estiver desativado
+        self._contadores = Counter()
+        self._tarefas = set()  # futures em segundo plano, canceladas ao encerrar
+        self.encerrada = False
+        self._lock = threading.Lock()
+
+    def contar(self, chave, valor=1):
+        """Incrementa um contador de métricas da análise."""
+        with self._lock:
+            self._contadores[chave] += valor
+
+    def metricas(self) -> dict:
+        with self._lock:
+            metricas = dict(self._contadores)
+        metricas["paginas_baixadas"] = self.paginas.downloads
+        metricas["downloads_evitados"] = self.paginas.reaproveitadas
+        metricas["paginas_sem_parse"] = self.paginas.nao_analisadas()
+        if self.memoria is not None:
+            metricas.update(self.memoria.metricas())
+        return metricas
+
+    def acompanhar(self, futuro):
+        """Registra uma tarefa em segundo plano da análise, cancelada se ainda não tiver começado ao encerrar."""
+        with self._lock:
+            if self.encerrada:
+                futuro.cancel()
+                return
+            self._tarefas.add(futuro)
+        futuro.add_done_callback(self._concluir_tarefa)
+
+    def _concluir_tarefa(self, futuro):
+        with self._lock:
+            self._tarefas.discard(futuro)
+
+    def encerrar(self):
+        """Cancela as tarefas pendentes, libera as árvores das páginas e para o acompanhamento de memória."""
+        with self._lock:
+            self.encerrada = True
+            tarefas, self._tarefas = self._tarefas, set()
+        for futuro in tarefas:
+            futuro.cancel()
+        self.paginas.liberar_arvores()
+        if self.memoria is not None:
+            self.memoria.encerrar()
+
+def contar(chave, valor=1):
+    """Incrementa um contador da análise em andamento (ignorado fora de uma análise)."""
+    analise = atual()
+    if analise is not None:
+        analise.contar(chave, valor)
+
+def atual():
+    """Retorna o contexto da análise em andamento, ou None fora de uma análise."""
+    return _analise_atual.get()
+
+def restante():
+    """Segundos até o prazo mais próximo (análise ou critério em execução); None se não houver prazo."""
+    analise = atual()
+    limites = [limite for limite in (getattr(analise, "limite", None), _limite_criterio.get()) if limite is not None]
+    if not limites:
+        return None
+    return min(limites) - time.monotonic()
+
+def esgotado():
+    """Se o prazo mais próximo já terminou."""
+    tempo = restante()
+    return tempo is not None and tempo <= 0
+
+def limitar_timeout(timeout):
+    """`timeout` reduzido ao tempo restante; levanta PrazoEsgotado se não houver mais tempo."""
+    tempo = restante()
+    if tempo is None:
+        return timeout
+    if tempo <= 0:
+        raise PrazoEsgotado("Prazo da análise esgotado.")
+    return min(timeout, tempo)
+
+@contextmanager
+def orcamento(segundos):
+    """Limita, durante o bloco, o tempo disponível para o critério em execução."""
+    token = _limite_criterio.set(time.monotonic() + segundos)
+    try:
+        yield
+    finally:
+        _limite_criterio.reset(token)
+
+@contextmanager
+def iniciar_analise(url, prazo=None):
+    """
+    Abre o contexto de uma nova análise durante o bloco `with`. `prazo` em
+    segundos (None usa SCRAPING_PRAZO_ANALISE; 0, sem prazo).
+    """
+    contexto = ContextoAnalise(url, PRAZO_PADRAO if prazo is None else prazo)
+    token = _analise_atual.set(contexto)
+    try:
+        yield contexto
+    finally:
+        _analise_atual.reset(token)
+        contexto.encerrar()
@@ -4,11 +4,28 @@ Template de avaliação de critério da Cartilha PNTP 2025
 Este arquivo deve ser usado como base para criar scrapers específicos por critério.
 """
 
-def avaliar(html: str, soup, url: str) -> dict:
+from scraping.paginas import Pagina
+
+# Identificação do critério, também lida pelo registro (ver `scraping.registro`)
+METADADOS = {
+    "codigo": "X.X",
+    "descricao": "Descrição do critério",
+    "fundamento": "Art. ..., Decreto ...",
+    "classificacao": "essencial",
+    "aplicavel_a": "Executivo",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     """
     Avalia o critério da cartilha PNTP com base na página fornecida.
 
-    Retorna um dicionário com os seguintes campos:
+    A `Pagina` traz a URL, o HTML bruto (`pagina.html`), a árvore do parser
+    (`pagina.soup`) e características já calculadas e compartilhadas entre os
+    critérios (`texto`, `texto_minusculo`, `links`, `inputs`, `iframes`, ...).
+    Prefira-as a refazer `get_text`/`find_all` sobre o soup. A árvore só é
+    construída se o critério usar alguma delas (ou o soup).
+
+    Retorna um dicionário com os seguintes campos (os cinco primeiros vêm de METADADOS):
     - codigo: código do critério (ex: 3.2)
     - descricao: descrição textual do critério
     - fundamento: base legal ou regulamentar
@@ -25,11 +42,7 @@ def avaliar(html: str, soup, url: str) -> dict:
     """
 
     resultado = {
-        "codigo": "X.X",
-        "descricao": "Descrição do critério",
-        "fundamento": "Art. ..., Decreto ...",
-        "classificacao": "essencial",
-        "aplicavel_a": "Executivo",
+        **METADADOS,
 
         "disponibilidade": False,
         "atualidade": False,
@@ -0,0 +1,96 @@
+"""
+Decodificação do corpo das páginas baixadas.
+
+A codificação é decidida pela fonte mais barata disponível, nesta ordem:
+1. charset declarado no cabeçalho Content-Type;
+2. BOM (byte order mark) no início do corpo;
+3. <meta charset> / <meta http-equiv> nos primeiros KB do documento;
+4. validação do corpo como UTF-8;
+5. detecção estatística sobre o corpo inteiro (último recurso, a mais cara).
+
+Os contadores registram qual fonte decidiu cada página.
+"""
+
+import codecs
+import re
+import threading
+from collections import Counter
+
+from requests.compat import chardet
+
+from scraping import contexto
+
+BYTES_SNIFF_META = 4096
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_PADRAO_CHARSET_CABECALHO = re.compile(r"charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_PADRAO_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+
+_lock = threading.Lock()
+_contadores = Counter()
+
+def _valida(codificacao):
+    try:
+        return codecs.lookup(codificacao).name
+    except (LookupError, TypeError):
+        return None
+
+def _registrar(origem):
+    with _lock:
+        _contadores[origem] += 1
+    contexto.contar(f"codificacao_{origem}")
+
+def _declarada(corpo, content_type):
+    """(codificacao, origem) pelas fontes 1 a 3, ou (None, None)."""
+    match = _PADRAO_CHARSET_CABECALHO.search(content_type or "")
+    if match and _valida(match.group(1)):
+        origem, codificacao = "cabecalho", match.group(1)
+    else:
+        origem, codificacao = None, None
+        for bom, nome in _BOMS:
+            if corpo.startswith(bom):
+                origem, codificacao = "bom", nome
+                break
+
+    if origem is None:
+        match = _PADRAO_META_CHARSET.search(corpo[:BYTES_SNIFF_META])
+        if match and _valida(match.group(1).decode("ascii", "ignore")):
+            origem, codificacao = "meta", match.group(1).decode("ascii")
+    return codificacao, origem
+
+def codificacao_provavel(inicio: bytes, content_type: str = "") -> str:
+    """
+    Codificação do corpo a partir apenas do seu início (fontes 1 a 3; senão UTF-8),
+    para decodificar o corpo enquanto ele ainda está chegando. Não é contabilizada.
+    """
+    codificacao, _ = _declarada(inicio, content_type)
+    return codificacao or "utf-8"
+
+def detectar(corpo: bytes, content_type: str = ""):
+    """Retorna (codificacao, origem) do corpo, usando a fonte mais barata disponível."""
+    codificacao, origem = _declarada(corpo, content_type)
+    if origem is None:
+        try:
+            corpo.decode("utf-8")
+            origem, codificacao = "utf8", "utf-8"
+        except UnicodeDecodeError:
+            origem, codificacao = "deteccao", chardet.detect(corpo)["encoding"] or "utf-8"
+
+    _registrar(origem)
+    return codificacao, origem
+
+def decodificar(corpo: bytes, codificacao) -> str:
+    """Decodifica o corpo, substituindo bytes inválidos (como o `response.text` do requests)."""
+    try:
+        return str(corpo, codificacao or "utf-8", errors="replace")
+    except LookupError:
+        return str(corpo, errors="replace")
+
+def estatisticas():
+    """Quantidade de páginas decididas por cada fonte de codificação no processo."""
+    with _lock:
+        return dict(_contadores)
@@ -0,0 +1,165 @@
+"""
+Descoberta dos links das subpáginas a partir da página inicial.
+
+Cada manager registra, na importação, os grupos de palavras-chave que
+identificam as subpáginas de que precisa (ex.: "receita prevista" para a página
+de receitas). Todas as palavras de todos os domínios formam um único reconhecedor
+compilado, e os links da página são varridos uma única vez: os textos das âncoras
+são normalizados uma vez, unidos num só texto e percorridos pelo reconhecedor
+(em C, pelo módulo `re`), em vez de cada manager normalizar cada palavra para
+cada link, grupo por grupo.
+
+A semântica é a mesma da busca link a link: para cada grupo vale o primeiro link,
+em ordem de documento, em que alguma palavra do grupo ocorre. O resultado guarda
+a posição do link e da ocorrência, e é memorizado na própria `Pagina`.
+"""
+
+import re
+import threading
+from bisect import bisect_right
+from itertools import accumulate
+from typing import NamedTuple
+
+from scraping.paginas import normalizar_texto
+
+class Ocorrencia(NamedTuple):
+    """Primeiro link de um grupo: posição do link na página e da palavra encontrada."""
+    href: str
+    indice_link: int
+    palavra: str
+    campo: str
+    inicio: int
+
+class _Automato:
+    """
+    Reconhecedor de todas as palavras registradas de uma só vez: uma alternância
+    compilada, em lookahead, aponta cada posição em que alguma palavra começa
+    (inclusive sobrepostas); as palavras daquela posição são então conferidas.
+    """
+
+    def __init__(self, padroes):
+        self.padroes = padroes  # palavra -> {(grupo, campo)}
+        self.campos = {campo for alvos in padroes.values() for _, campo in alvos}
+        self.por_inicial = {}
+        for padrao in padroes:
+            self.por_inicial.setdefault(padrao[0], []).append(padrao)
+        ordenados = sorted(padroes, key=len, reverse=True)
+        self.regex = re.compile("(?=(?:%s))" % "|".join(map(re.escape, ordenados))) if ordenados else None
+
+    def procurar(self, texto):
+        """Gera (inicio, palavra, alvos) para cada ocorrência de palavra no texto."""
+        if self.regex is None:
+            return
+        for match in self.regex.finditer(texto):
+            inicio = match.start()
+            for padrao in self.por_inicial[texto[inicio]]:
+                if texto.startswith(padrao, inicio):
+                    yield inicio, padrao, self.padroes[padrao]
+
+# Separa os textos dos links no texto único varrido (não ocorre nas palavras-chave)
+SEPARADOR = "\x00"
+
+_lock = threading.Lock()
+_grupos = {}         # (dominio, chave) -> [(campo, palavra)]
+_timeouts = {}       # (dominio, chave) -> timeout da subpágina, em segundos
+_automato = None
+_versao = 0
+
+def registrar(dominio, chave, palavras, normalizar=False, href=False, timeout=15):
+    """
+    Registra o grupo `chave` do domínio: o primeiro link cujo texto contenha uma
+    das `palavras`. Com `normalizar`, texto e palavras são comparados sem acentos;
+    com `href`, as palavras também são procuradas no href (em minúsculas).
+    `timeout` é o usado pelo manager para carregar a subpágina do grupo.
+    """
+    global _automato, _versao
+    palavras = [p for p in palavras if p]
+    campo_texto = "texto_normalizado" if normalizar else "texto"
+    termos = [(campo_texto, normalizar_texto(p) if normalizar else p.lower()) for p in palavras]
+    if href:
+        termos += [("href", p.lower()) for p in palavras]
+    with _lock:
+        _grupos[(dominio, chave)] = termos
+        _timeouts[(dominio, chave)] = timeout
+        _automato = None
+        _versao += 1
+
+def _automato_atual():
+    global _automato
+    with _lock:
+        if _automato is None:
+            padroes = {}
+            for grupo, termos in _grupos.items():
+                for campo, palavra in termos:
+                    padroes.setdefault(palavra, set()).add((grupo, campo))
+            _automato = _Automato(padroes)
+        return _automato, _versao
+
+def compilar():
+    """Compila já o reconhecedor com os grupos registrados (ver `registro.construir`)."""
+    _automato_atual()
+
+def grupos() -> set:
+    """Grupos (dominio, chave) registrados."""
+    with _lock:
+        return set(_grupos)
+
+def _valores(links, campo):
+    if campo == "texto":
+        return [link.texto.lower() for link in links]
+    if campo == "href":
+        return [link.href.lower() for link in links]
+    # A normalização é local a cada caractere: pode ser feita no texto já unido
+    unidos = SEPARADOR.join(link.texto.replace(SEPARADOR, " ") for link in links)
+    return normalizar_texto(unidos).split(SEPARADOR)
+
+def _resolver(pagina, automato):
+    links = pagina.links
+    encontrados = {}
+    for campo in sorted(automato.campos):
+        valores = _valores(links, campo)
+        inicios = list(accumulate((len(valor) + 1 for valor in valores[:-1]), initial=0))
+        for posicao, padrao, alvos in automato.procurar(SEPARADOR.join(valores)):
+            indice = bisect_right(inicios, posicao) - 1
+            for grupo, campo_alvo in alvos:
+                anterior = encontrados.get(grupo)
+                if campo_alvo == campo and (anterior is None or indice < anterior.indice_link):
+                    encontrados[grupo] = Ocorrencia(links[indice].href, indice, padrao, campo, posicao - inicios[indice])
+    return encontrados
+
+def resolver(pagina, dominio):
+    """
+    Retorna {chave: Ocorrencia ou None} para os grupos registrados pelo domínio.
+    A varredura cobre os grupos de todos os domínios e é feita uma vez por página.
+    """
+    automato, versao = _automato_atual()
+    encontrados = pagina.memorizado(("descoberta", versao), lambda: _resolver(pagina, automato))
+    with _lock:
+        chaves = [chave for (dono, chave) in _grupos if dono == dominio]
+    return {chave: encontrados.get((dominio, chave)) for chave in chaves}
+
+def classificar(href, textos):
+    """
+    Grupos (dominio, chave) em que este link, isoladamente, se encaixa. Usado na
+    leitura antecipada da página inicial (`scraping.antecipacao`); a escolha final
+    do link de cada grupo continua sendo a de `resolver`.
+    """
+    automato, _ = _automato_atual()
+    texto = " ".join(textos)
+    valores = {"texto": texto.lower(), "href": href.lower()}
+    if "texto_normalizado" in automato.campos:
+        valores["texto_normalizado"] = normalizar_texto(texto)
+    grupos = set()
+    for campo in automato.campos:
+        for _, _, alvos in automato.procurar(valores[campo]):
+            grupos.update(grupo for grupo, campo_alvo in alvos if campo_alvo == campo)
+    return grupos
+
+def timeout(grupo):
+    """Timeout registrado para a subpágina do grupo (dominio, chave)."""
+    with _lock:
+        return _timeouts.get(grupo, 15)
+
+def links(pagina, dominio):
+    """Como `resolver`, mas retorna apenas o href de cada grupo (ou None)."""
+    return {chave: ocorrencia.href if ocorrencia else None for chave, ocorrencia in resolver(pagina, dominio).items()}
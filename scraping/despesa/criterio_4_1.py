@@ -26,18 +26,21 @@ Filtro de Pesquisa:
 - Deve haver filtros por ano, mês ou período
 """
 
-import re
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "4.1",
+    "descricao": "Divulga o total das despesas empenhadas, liquidadas e pagas?",
+    "fundamento": "Art. 7º, VI e 8º, §1º, III da LAI; LC 101/00 art. 48, 48-A; Dec. 10.540/20 art. 8º",
+    "classificacao": "essencial",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "4.1",
-        "descricao": "Divulga o total das despesas empenhadas, liquidadas e pagas?",
-        "fundamento": "Art. 7º, VI e 8º, §1º, III da LAI; LC 101/00 art. 48, 48-A; Dec. 10.540/20 art. 8º",
-        "classificacao": "essencial",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": False,
         "serie_historica": False,
@@ -47,7 +50,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
     }
 
     justificativas = []
-    texto = soup.get_text(separator=" ", strip=True).lower()
+    texto = pagina.texto_minusculo
 
     # Verifica colunas de despesa
     if all(p in texto for p in ["empenhado", "liquidado", "pago"]):
@@ -55,28 +58,25 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         justificativas.append("Totais de despesa empenhada, liquidada e paga identificados.")
 
     # Verifica data de atualização
-    match_data = re.search(r"última atualização[:\s]+(\d{2}/\d{2}/\d{4})", html, re.IGNORECASE)
-    if match_data:
-        try:
-            data = datetime.strptime(match_data.group(1), "%d/%m/%Y")
-            if datetime.now() - data <= timedelta(days=30):
-                resultado["atualidade"] = True
-                justificativas.append(f"Atualizado em {match_data.group(1)}")
-            else:
-                justificativas.append(f"Data desatualizada: {match_data.group(1)}")
-        except:
+    data = pagina.sinais.ultima_atualizacao
+    if data:
+        if data.valor is None:
             justificativas.append("Data presente, mas não pôde ser interpretada.")
+        elif datetime.now() - data.valor <= timedelta(days=30):
+            resultado["atualidade"] = True
+            justificativas.append(f"Atualizado em {data.texto}")
+        else:
+            justificativas.append(f"Data desatualizada: {data.texto}")
 
     # Verifica série histórica
-    anos = re.findall(r"\b(20[0-2][0-9])\b", html)
-    if len(set(anos)) >= 3:
+    anos = pagina.sinais.anos
+    if len(anos) >= 3:
         resultado["serie_historica"] = True
-        justificativas.append(f"Série histórica com anos: {', '.join(sorted(set(anos)))}")
+        justificativas.append(f"Série histórica com anos: {', '.join(sorted(anos))}")
 
     # Verifica opções de exportação
     formatos = ["csv", "xls", "xlsx", "json", "xml"]
-    links = soup.find_all("a", href=True)
-    if any(any(fmt in a["href"].lower() for fmt in formatos) for a in links):
+    if pagina.sinais.exporta(formatos):
         resultado["gravacao"] = True
         justificativas.append("Exportação de relatórios identificada.")
 
@@ -29,18 +29,21 @@ Filtro de Pesquisa:
 Deve permitir busca por número do empenho, nome/CPF/CNPJ do credor, mês, ano.
 """
 
-import re
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "4.3",
+    "descricao": "Consulta de empenhos com detalhes do credor, objeto e licitação?",
+    "fundamento": "LAI, LC 101/2000, Decreto 10.540/2020 art. 8º-I-h",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "4.3",
-        "descricao": "Consulta de empenhos com detalhes do credor, objeto e licitação?",
-        "fundamento": "LAI, LC 101/2000, Decreto 10.540/2020 art. 8º-I-h",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": False,
         "serie_historica": False,
@@ -50,7 +53,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
     }
 
     justificativas = []
-    texto = soup.get_text(separator=" ", strip=True).lower()
+    texto = pagina.texto_minusculo
 
     # Verifica presença dos elementos obrigatórios em qualquer parte da tabela ou detalhe
     if all(t in texto for t in ["credor", "objeto", "modalidade", "nº", "licitacao"]) or "procedimento licitatorio" in texto:
@@ -58,28 +61,25 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         justificativas.append("Informações de credor, objeto e licitação identificadas.")
 
     # Atualidade
-    match_data = re.search(r"última atualização[:\s]+(\d{2}/\d{2}/\d{4})", html, re.IGNORECASE)
-    if match_data:
-        try:
-            data = datetime.strptime(match_data.group(1), "%d/%m/%Y")
-            if datetime.now() - data <= timedelta(days=30):
-                resultado["atualidade"] = True
-                justificativas.append(f"Atualizado em {match_data.group(1)}")
-            else:
-                justificativas.append(f"Data desatualizada: {match_data.group(1)}")
-        except:
+    data = pagina.sinais.ultima_atualizacao
+    if data:
+        if data.valor is None:
             justificativas.append("Data presente, mas não interpretável.")
+        elif datetime.now() - data.valor <= timedelta(days=30):
+            resultado["atualidade"] = True
+            justificativas.append(f"Atualizado em {data.texto}")
+        else:
+            justificativas.append(f"Data desatualizada: {data.texto}")
 
     # Série histórica
-    anos = re.findall(r"\b(20[0-2][0-9])\b", html)
-    if len(set(anos)) >= 3:
+    anos = pagina.sinais.anos
+    if len(anos) >= 3:
         resultado["serie_historica"] = True
-        justificativas.append(f"Série histórica com anos: {', '.join(sorted(set(anos)))}")
+        justificativas.append(f"Série histórica com anos: {', '.join(sorted(anos))}")
 
     # Exportação
     formatos = ["csv", "xls", "xlsx", "json", "xml"]
-    links = soup.find_all("a", href=True)
-    if any(any(fmt in a["href"].lower() for fmt in formatos) for a in links):
+    if pagina.sinais.exporta(formatos):
         resultado["gravacao"] = True
         justificativas.append("Exportação de relatórios disponível.")
 
@@ -26,18 +26,21 @@ Filtro de Pesquisa:
 - Deve permitir filtro por fornecedor, serviço, veículo, tipo de mídia, período, etc.
 """
 
-import re
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "4.6",
+    "descricao": "Publica informações sobre contratos de publicidade com fornecedores, veículos e valores?",
+    "fundamento": "Lei 12.527/2011 (LAI); Lei 13.303/2016; Lei 12.232/2010",
+    "classificacao": "recomendada",
+    "aplicavel_a": "Estatais",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "4.6",
-        "descricao": "Publica informações sobre contratos de publicidade com fornecedores, veículos e valores?",
-        "fundamento": "Lei 12.527/2011 (LAI); Lei 13.303/2016; Lei 12.232/2010",
-        "classificacao": "recomendada",
-        "aplicavel_a": "Estatais",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": False,
         "serie_historica": False,
@@ -47,7 +50,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
     }
 
     justificativas = []
-    texto = soup.get_text(separator=" ", strip=True).lower()
+    texto = pagina.texto_minusculo
 
     # Disponibilidade
     termos = ["publicidade", "fornecedor", "veículo", "tipo de serviço", "meio de divulgação", "valores pagos"]
@@ -57,28 +60,25 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         justificativas.append(f"Elementos encontrados: {', '.join(encontrados)}")
 
     # Atualidade
-    match_data = re.search(r"última atualização[:\s]+(\d{2}/\d{2}/\d{4})", html, re.IGNORECASE)
-    if match_data:
-        try:
-            data = datetime.strptime(match_data.group(1), "%d/%m/%Y")
-            if datetime.now() - data <= timedelta(days=183):
-                resultado["atualidade"] = True
-                justificativas.append(f"Atualizado em {match_data.group(1)}")
-            else:
-                justificativas.append(f"Data desatualizada: {match_data.group(1)}")
-        except:
+    data = pagina.sinais.ultima_atualizacao
+    if data:
+        if data.valor is None:
             justificativas.append("Data presente, mas não interpretável.")
+        elif datetime.now() - data.valor <= timedelta(days=183):
+            resultado["atualidade"] = True
+            justificativas.append(f"Atualizado em {data.texto}")
+        else:
+            justificativas.append(f"Data desatualizada: {data.texto}")
 
     # Série Histórica
-    anos = re.findall(r"\b(20[0-2][0-9])\b", html)
-    if len(set(anos)) >= 3:
+    anos = pagina.sinais.anos
+    if len(anos) >= 3:
         resultado["serie_historica"] = True
-        justificativas.append(f"Série histórica com anos: {', '.join(sorted(set(anos)))}")
+        justificativas.append(f"Série histórica com anos: {', '.join(sorted(anos))}")
 
     # Gravação de Relatórios
     formatos = ["csv", "xls", "xlsx", "json", "xml"]
-    links = soup.find_all("a", href=True)
-    if any(any(fmt in a["href"].lower() for fmt in formatos) for a in links):
+    if pagina.sinais.exporta(formatos):
         resultado["gravacao"] = True
         justificativas.append("Exportação disponível.")
 
@@ -0,0 +1,232 @@
+"""
+Execução dos critérios do catálogo (ver `scraping.registro`) sobre uma página inicial.
+
+A execução segue o grafo de dependências entre páginas e critérios:
+
+    página inicial → links dos grupos (descoberta) → páginas alvo → critérios
+
+Primeiro a página alvo de cada critério é resolvida em URL (todos os grupos de
+links numa única varredura da página inicial). As URLs distintas formam o conjunto
+mínimo de páginas a baixar: cada uma vira uma tarefa que carrega a página e, em
+seguida, avalia todos os critérios que a leem, mantendo a árvore do parser viva
+só enquanto eles rodam. As tarefas correm em paralelo.
+
+Se a página alvo falha, os critérios que a leem recebem a página de fallback. Um
+erro em um critério descarta os resultados do domínio inteiro, como quando cada
+manager avaliava seu domínio isoladamente.
+
+Prazo: cada critério roda com um orçamento (a parte que lhe cabe do tempo restante,
+até SCRAPING_ORCAMENTO_CRITERIO), que limita os downloads feitos por ele (ex.:
+iframes). Critérios cuja página não chegou a tempo, que esgotaram o orçamento ou
+que chegariam depois do prazo da análise entram no resultado marcados com
+"avaliado": False, e a análise termina com resultados parciais. Todos os demais
+resultados levam "avaliado": True.
+
+Reavaliação incremental: cada resultado leva a versão do critério (ver
+`registro.Catalogo.versoes`) e [url, hash] de cada página que ele leu. Com os
+resultados da análise anterior da mesma URL (`anteriores`), um critério não roda
+de novo se a versão é a mesma e as páginas lidas têm o mesmo conteúdo; o resultado
+anterior é copiado inteiro, marcado com "reaproveitado": True. Critérios que dependem da
+data da avaliação só são reaproveitados no mesmo dia (UTC).
+
+Configuração:
+- SCRAPING_PAGINAS_PARALELAS: páginas carregadas e avaliadas ao mesmo tempo por análise (padrão 8)
+- SCRAPING_ORCAMENTO_CRITERIO: tempo máximo de cada critério, em segundos (padrão 30)
+- SCRAPING_PRAZO_MARGEM: critérios não começam com menos que isto até o prazo (padrão 0.5)
+"""
+
+import os
+from datetime import datetime
+from urllib.parse import urljoin
+
+from scraping import concorrencia, contexto, descoberta, memoria, paginas, registro
+
+MAX_PAGINAS_PARALELAS = int(os.getenv("SCRAPING_PAGINAS_PARALELAS", 8))
+ORCAMENTO_CRITERIO = float(os.getenv("SCRAPING_ORCAMENTO_CRITERIO", 30))
+MARGEM_PRAZO = float(os.getenv("SCRAPING_PRAZO_MARGEM", 0.5))
+
+# Campos que a reavaliação incremental acrescenta a cada resultado: são guardados no
+# banco, mas não fazem parte do resultado exposto pela API
+CAMPOS_INCREMENTAIS = ("versao_criterio", "paginas_entrada")
+
+def _resolver_url(especificacao, dominio, pagina_inicial, links):
+    """URL absoluta indicada pela especificação, ou None para a página inicial / não encontrada."""
+    if especificacao is registro.INICIAL:
+        return None
+    if callable(especificacao):
+        url = especificacao(pagina_inicial)
+    else:
+        if dominio not in links:
+            links[dominio] = descoberta.links(pagina_inicial, dominio)
+        url = links[dominio].get(especificacao)
+    return urljoin(pagina_inicial.url, url) if url else None
+
+def _timeout(especificacao, dominio):
+    if isinstance(especificacao, str):
+        return descoberta.timeout((dominio, especificacao))
+    return 15
+
+def planejar(pagina_inicial, criterios):
+    """
+    Retorna {url alvo ou None: [(criterio, url de fallback ou None)]} e {url: timeout}.
+    A chave None agrupa os critérios lidos na própria página inicial.
+    """
+    links = {}
+    plano, timeouts = {}, {}
+    for criterio in criterios:
+        alvo = _resolver_url(criterio.pagina, criterio.dominio, pagina_inicial, links)
+        fallback = _resolver_url(criterio.fallback, criterio.dominio, pagina_inicial, links)
+        plano.setdefault(alvo, []).append((criterio, fallback))
+        for url, especificacao in ((alvo, criterio.pagina), (fallback, criterio.fallback)):
+            if url is not None:
+                timeouts[url] = max(timeouts.get(url, 0), _timeout(especificacao, criterio.dominio))
+    return plano, timeouts
+
+def _carregar(url, timeouts, pagina_inicial):
+    """A página da URL (a inicial se a URL for None); None se a carga falhar."""
+    if url is None:
+        return pagina_inicial
+    try:
+        return paginas.carregar_pagina(url, timeout=timeouts[url])
+    except (memoria.MemoriaExcedida, contexto.PrazoEsgotado):
+        raise
+    except Exception:
+        return None
+
+def nao_avaliado(criterio, motivo="prazo da análise esgotado") -> dict:
+    """Resultado de um critério que não chegou a ser avaliado, com os mesmos campos de um avaliado."""
+    contexto.contar("criterios_nao_avaliados")
+    return {
+        **criterio.metadados,
+        "avaliado": False,
+        "disponibilidade": None,
+        "atualidade": None,
+        "serie_historica": None,
+        "gravacao": None,
+        "filtro": None,
+        "justificativa": f"Critério não avaliado: {motivo}.",
+        # Sem versão nem páginas lidas: nunca é reaproveitado
+        "versao_criterio": None,
+        "paginas_entrada": None,
+    }
+
+def _reaproveitavel(criterio, anterior, versao, pagina) -> bool:
+    """O resultado anterior vale para esta análise: mesma versão e mesmas páginas lidas."""
+    if not anterior or not anterior.get("resultado") or not versao or anterior.get("versao_criterio") != versao:
+        return False
+    if criterio.depende_da_data:
+        data = anterior.get("data_analise")
+        if data is None or data.date() != datetime.utcnow().date():
+            return False
+
+    entrada = anterior.get("paginas_entrada") or []
+    if not entrada or list(entrada[0]) != [pagina.url, pagina.hash]:
+        return False
+    for url, hash_anterior in entrada[1:]:
+        # Páginas lidas pelo próprio critério (ex.: iframes) ou de que ele depende (a
+        # inicial, ver `paginas.registrar_dependencia`): baixadas só para comparar
+        atual = _carregar(url, {url: 15}, pagina) if hash_anterior else None
+        if atual is None or atual.hash != hash_anterior:
+            return False
+    return True
+
+def reaproveitado(criterio, anterior, versao) -> dict:
+    """Resultado anterior do critério, copiado para a análise atual."""
+    contexto.contar("criterios_reaproveitados")
+    return {
+        **anterior["resultado"],
+        "avaliado": True,
+        "reaproveitado": True,
+        "versao_criterio": versao,
+        "paginas_entrada": [list(item) for item in anterior["paginas_entrada"]],
+    }
+
+def _orcamento(restante, pendentes):
+    """Tempo do próximo critério: sua parte do tempo restante, até ORCAMENTO_CRITERIO."""
+    if restante is None:
+        return ORCAMENTO_CRITERIO
+    return min(ORCAMENTO_CRITERIO, restante / pendentes)
+
+def _avaliar_grupo(alvo, itens, timeouts, pagina_inicial, versoes, anteriores, ao_avaliar=None):
+    """Carrega a página alvo e avalia os critérios que a leem. Retorna [(criterio, resultado ou erro)]."""
+    avaliados = []
+
+    def concluir(criterio, resultado):
+        avaliados.append((criterio, resultado))
+        if ao_avaliar is not None and not isinstance(resultado, Exception):
+            try:
+                ao_avaliar(criterio, resultado)
+            except Exception as e:
+                # Quem acompanha a análise não a interrompe
+                print(f"[AVISO] Falha ao informar o resultado do critério {criterio.codigo}: {e}")
+
+    try:
+        pagina_alvo = _carregar(alvo, timeouts, pagina_inicial)
+    except contexto.PrazoEsgotado:
+        for criterio, _ in itens:
+            concluir(criterio, nao_avaliado(criterio, "a página não foi carregada dentro do prazo"))
+        return avaliados
+
+    with (pagina_alvo or pagina_inicial).em_uso():
+        for posicao, (criterio, fallback) in enumerate(itens):
+            restante = contexto.restante()
+            if restante is not None and restante <= MARGEM_PRAZO:
+                concluir(criterio, nao_avaliado(criterio))
+                continue
+            try:
+                pagina = pagina_alvo or _carregar(fallback, timeouts, pagina_inicial) or pagina_inicial
+                versao, anterior = versoes.get(criterio.codigo), anteriores.get(criterio.codigo)
+                with contexto.orcamento(_orcamento(restante, len(itens) - posicao)):
+                    if _reaproveitavel(criterio, anterior, versao, pagina):
+                        concluir(criterio, reaproveitado(criterio, anterior, versao))
+                        continue
+                    entrada = []
+                    resultado = paginas.avaliar_criterio(criterio.avaliar, pagina, entrada)
+                resultado["avaliado"] = True
+                resultado["versao_criterio"], resultado["paginas_entrada"] = versao, entrada
+                concluir(criterio, resultado)
+            except memoria.MemoriaExcedida:
+                raise
+            except contexto.PrazoEsgotado:
+                concluir(criterio, nao_avaliado(criterio, "tempo do critério esgotado"))
+            except Exception as e:
+                concluir(criterio, e)
+    return avaliados
+
+def executar(pagina_inicial, dominios=None, max_paralelo=MAX_PAGINAS_PARALELAS, catalogo=None, anteriores=None, ao_avaliar=None) -> dict:
+    """
+    Avalia os critérios do catálogo (ver `registro.catalogo`) dos `dominios` (todos, se None).
+    Retorna {dominio: [resultados na ordem de registro]}; domínios com erro ficam de fora.
+
+    `anteriores`: {codigo: dados da análise anterior da mesma URL}, com as chaves "resultado"
+    (o dicionário do critério), "versao_criterio", "paginas_entrada" e "data_analise"; os
+    ainda válidos são reaproveitados.
+    `ao_avaliar(criterio, resultado)`: chamada assim que cada critério termina (de uma das
+    threads da execução, fora da ordem de registro). Um critério que falha não é informado,
+    e os resultados já informados de um domínio com erro ficam fora do retorno.
+    """
+    catalogo = catalogo or registro.catalogo()
+    criterios = catalogo.criterios_de(dominios)
+    plano, timeouts = planejar(pagina_inicial, criterios)
+
+    avaliados = {}
+    with pagina_inicial.em_uso():
+        for grupo in concorrencia.mapear_em_paralelo(
+            lambda item: _avaliar_grupo(item[0], item[1], timeouts, pagina_inicial, catalogo.versoes, anteriores or {}, ao_avaliar),
+            plano.items(),
+            max_paralelo,
+        ):
+            avaliados.update((criterio.codigo, resultado) for criterio, resultado in grupo)
+
+    resultados = {}
+    for criterio in criterios:
+        resultado = avaliados[criterio.codigo]
+        if criterio.dominio not in resultados:
+            resultados[criterio.dominio] = []
+        if isinstance(resultado, Exception):
+            if resultados[criterio.dominio] is not None:
+                print(f"[ERRO] ao avaliar domínio '{criterio.dominio}': {resultado}")
+            resultados[criterio.dominio] = None
+        elif resultados[criterio.dominio] is not None:
+            resultados[criterio.dominio].append(resultado)
+    return {dominio: lista for dominio, lista in resultados.items() if lista is not None}
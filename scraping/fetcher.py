@@ -0,0 +1,284 @@
+"""
+Cliente HTTP compartilhado por todo o pipeline de scraping.
+
+Todas as requisições (página inicial, subpáginas dos domínios e iframes) passam
+por uma única sessão `requests` com pool de conexões keep-alive por host, de modo
+que uma análise reaproveita a mesma conexão TCP+TLS com o portal avaliado em vez
+de abrir uma nova a cada página.
+
+Os corpos são baixados em streaming: respostas com Content-Type binário (PDF,
+planilhas etc.) são recusadas antes do download e páginas maiores que o limite
+configurado são truncadas, o que limita a memória por worker e evita que um link
+ruim prenda a análise até o timeout.
+
+Os timeouts passados pelos chamadores funcionam como teto: o valor efetivo é
+derivado da latência recente do host (ver `scraping.hosts`), URLs com falhas
+recentes são recusadas de imediato e, opcionalmente, uma segunda requisição
+(hedge) é disparada quando a primeira não recebe os cabeçalhos da resposta
+dentro do percentil 95 de latência do host (que também mede o tempo até os
+cabeçalhos). Um corpo que apenas demora a chegar não dispara hedge. O atraso só
+conta depois que a primeira obteve sua vaga no host (a espera na fila do
+`agendador` não dispara hedges), e a requisição que perde é interrompida,
+devolvendo a vaga e descartando a conexão.
+
+Configuração (variáveis de ambiente):
+- SCRAPING_POOL_CONEXOES: quantidade de hosts distintos mantidos no pool (padrão 20)
+- SCRAPING_POOL_MAX_POR_HOST: conexões keep-alive mantidas por host (padrão 10)
+- SCRAPING_MAX_BYTES_PAGINA: bytes lidos no máximo por página (padrão 5 MB)
+- SCRAPING_HEDGE: "1" ativa as requisições de hedge (padrão desativado)
+- SCRAPING_HEDGE_THREADS: requisições com hedge simultâneas no processo (padrão 16)
+"""
+
+import contextvars
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from scraping import agendador, contexto, hosts, reproducao
+
+POOL_CONEXOES = int(os.getenv("SCRAPING_POOL_CONEXOES", 20))
+POOL_MAX_POR_HOST = int(os.getenv("SCRAPING_POOL_MAX_POR_HOST", 10))
+MAX_BYTES_PAGINA = int(os.getenv("SCRAPING_MAX_BYTES_PAGINA", 5 * 1024 * 1024))
+HEDGE = os.getenv("SCRAPING_HEDGE", "0").lower() in ("1", "true", "sim")
+HEDGE_THREADS = int(os.getenv("SCRAPING_HEDGE_THREADS", 16))
+
+# Tipos de conteúdo aceitos; qualquer outro é recusado antes de baixar o corpo
+TIPOS_ACEITOS = ("text/", "application/xhtml+xml", "application/xml")
+TAMANHO_BLOCO = 64 * 1024
+
+class ConteudoNaoSuportado(Exception):
+    """A URL aponta para um conteúdo que não é uma página HTML (PDF, planilha etc.)."""
+
+class _Cancelada(Exception):
+    """Requisição de um hedge interrompida porque a outra respondeu antes."""
+
+class Resposta(NamedTuple):
+    url: str
+    status: int
+    cabecalhos: CaseInsensitiveDict
+    corpo: bytes
+    truncada: bool
+
+_lock = threading.Lock()
+_contadores = {"requisicoes": 0, "conexoes_novas": 0, "bytes_recebidos": 0, "paginas_truncadas": 0}
+
+def _incrementar(chave, valor=1):
+    with _lock:
+        _contadores[chave] = _contadores.get(chave, 0) + valor
+
+# --- Pools com contagem de conexões abertas ---
+class _PoolHTTP(HTTPConnectionPool):
+    def _new_conn(self):
+        _incrementar("conexoes_novas")
+        return super()._new_conn()
+
+class _PoolHTTPS(HTTPSConnectionPool):
+    def _new_conn(self):
+        _incrementar("conexoes_novas")
+        return super()._new_conn()
+
+class _AdaptadorPool(HTTPAdapter):
+    """Adapter que usa os pools acima e conta cada requisição enviada."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _PoolHTTP, "https": _PoolHTTPS}
+
+    def send(self, request, **kwargs):
+        _incrementar("requisicoes")
+        return super().send(request, **kwargs)
+
+def _criar_sessao():
+    sessao = requests.Session()
+    adaptador = _AdaptadorPool(pool_connections=POOL_CONEXOES, pool_maxsize=POOL_MAX_POR_HOST)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+_sessao = _criar_sessao()
+
+# --- Download ---
+def _tipo_aceito(content_type):
+    tipo = content_type.split(";")[0].strip().lower()
+    return not tipo or tipo.startswith(TIPOS_ACEITOS)
+
+def _baixar(url, timeout, cabecalhos, limite, ao_receber=None, tentativa=None):
+    response = _sessao.get(url, timeout=timeout, headers=cabecalhos, stream=True)
+    try:
+        if tentativa is not None:
+            tentativa.respondida.set()
+            tentativa.verificar()
+        hosts.registrar_latencia(url, response.elapsed.total_seconds())
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        if not _tipo_aceito(content_type):
+            raise ConteudoNaoSuportado(f"Conteúdo não suportado ({content_type}) em {url}")
+
+        partes = []
+        lidos = 0
+        truncada = False
+        for bloco in response.iter_content(TAMANHO_BLOCO):
+            partes.append(bloco)
+            lidos += len(bloco)
+            if ao_receber is not None:
+                ao_receber(bloco, content_type)
+            if contexto.esgotado():
+                raise contexto.PrazoEsgotado(f"Prazo esgotado durante o download de {url}.")
+            if tentativa is not None:
+                tentativa.verificar()
+            if lidos > limite:
+                truncada = True
+                break
+        corpo = b"".join(partes)[:limite]
+        _incrementar("bytes_recebidos", len(corpo))
+        if truncada:
+            _incrementar("paginas_truncadas")
+        return Resposta(response.url, response.status_code, response.headers, corpo, truncada)
+    finally:
+        # Corpo lido por completo: a conexão volta ao pool; truncado: a conexão é descartada
+        response.close()
+
+def _baixar_reservado(url, timeout, cabecalhos, limite, ao_receber=None, tentativa=None):
+    with agendador.reservar(url, tentativa.cancelada if tentativa is not None else None):
+        if tentativa is not None:
+            tentativa.verificar()
+            tentativa.reservada.set()
+        return _baixar(url, timeout, cabecalhos, limite, ao_receber, tentativa)
+
+_executor_hedge = ThreadPoolExecutor(max_workers=max(HEDGE_THREADS, 1), thread_name_prefix="hedge")
+
+class _Tentativa:
+    """Uma das requisições de um hedge; a que perde é cancelada pela outra."""
+
+    def __init__(self, url):
+        self.url = url
+        self.reservada = threading.Event()  # obteve a vaga no host (ou terminou antes disso)
+        self.respondida = threading.Event()  # recebeu os cabeçalhos da resposta (ou terminou antes)
+        self.cancelada = threading.Event()
+        self.futuro = None
+
+    def iniciar(self, funcao, *args):
+        self.futuro = _executor_hedge.submit(contextvars.copy_context().run, funcao, *args, tentativa=self)
+        self.futuro.add_done_callback(self._concluir)
+        return self.futuro
+
+    def _concluir(self, _):
+        self.reservada.set()
+        self.respondida.set()
+
+    def verificar(self):
+        if self.cancelada.is_set():
+            raise _Cancelada()
+
+    def cancelar(self):
+        # Ainda na fila do executor: nem começa; na fila do host: sai dela sem consumir
+        # token; baixando: para no próximo bloco, e o `finally` de `_baixar` fecha a resposta
+        self.cancelada.set()
+        self.futuro.cancel()
+        agendador.despertar(self.url)
+
+def _baixar_com_hedge(url, timeout, cabecalhos, limite, atraso, ao_receber=None):
+    """
+    Dispara uma segunda requisição se a primeira, depois de obter a vaga no host,
+    não receber os cabeçalhos da resposta em `atraso` segundos; com os cabeçalhos
+    recebidos, o corpo é esperado sem hedge. Só a primeira repassa os blocos a
+    `ao_receber`. A requisição que perde é cancelada.
+    """
+    primeira, segunda = _Tentativa(url), _Tentativa(url)
+    primeira.iniciar(_baixar_reservado, url, timeout, cabecalhos, limite, ao_receber)
+    primeira.reservada.wait()
+    if primeira.respondida.wait(atraso):
+        return primeira.futuro.result()
+
+    contexto.contar("hedges_disparados")
+    segunda.iniciar(_baixar_reservado, url, timeout, cabecalhos, limite)
+    pendentes = {primeira.futuro: primeira, segunda.futuro: segunda}
+    erro = None
+    while pendentes:
+        concluidas, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+        for futuro in concluidas:
+            pendentes.pop(futuro)
+            try:
+                resposta = futuro.result()
+            except Exception as e:
+                erro = e
+                continue
+            for perdedora in pendentes.values():
+                perdedora.cancelar()
+            if futuro is segunda.futuro:
+                contexto.contar("hedges_vencedores")
+            return resposta
+    raise erro
+
+def _baixar_monitorado(url, timeout, cabecalhos, max_bytes, ao_receber=None):
+    hosts.verificar(url)
+    limite = MAX_BYTES_PAGINA if max_bytes is None else max_bytes
+    tempo_limite = hosts.timeouts(url, timeout)
+    atraso_hedge = hosts.percentil(url, 95) if HEDGE else None
+
+    try:
+        if atraso_hedge is not None:
+            resposta = _baixar_com_hedge(url, tempo_limite, cabecalhos, limite, atraso_hedge, ao_receber)
+        else:
+            resposta = _baixar_reservado(url, tempo_limite, cabecalhos, limite, ao_receber)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        # Timeout encurtado pelo prazo da análise não é falha do host
+        if isinstance(e, requests.Timeout) and contexto.esgotado():
+            raise contexto.PrazoEsgotado(f"Prazo esgotado durante o download de {url}.") from e
+        hosts.registrar_falha(url, conexao=True)
+        raise
+    except requests.RequestException:
+        hosts.registrar_falha(url)
+        raise
+
+    hosts.registrar_sucesso(url)
+    return resposta
+
+# --- API pública ---
+def baixar(url, timeout=15, cabecalhos=None, max_bytes=None, ao_receber=None) -> Resposta:
+    """
+    Faz um GET em streaming pela sessão compartilhada e valida o status HTTP.
+
+    Lê no máximo `max_bytes` (padrão MAX_BYTES_PAGINA) do corpo; se a página for
+    maior, o restante é descartado e a resposta volta marcada como truncada.
+    Levanta ConteudoNaoSuportado para Content-Types binários. O download só
+    começa depois de obter uma vaga no host pelo `agendador`.
+
+    Se informado, `ao_receber(bloco, content_type)` é chamado com cada bloco do
+    corpo assim que ele chega (ver `scraping.antecipacao`).
+
+    `timeout` é o teto; o valor efetivo vem do histórico de latência do host.
+    Levanta hosts.FalhaRecente se a URL ou o host falharam repetidamente há pouco.
+
+    Com um acervo de `reproducao` ativo, a resposta é gravada ou, no modo de
+    reprodução, servida do acervo sem acessar a rede.
+    """
+    acervo = reproducao.atual()
+    if acervo is not None and acervo.reproduzindo:
+        resposta = acervo.reproduzir(url)
+        if ao_receber is not None:
+            ao_receber(resposta.corpo, resposta.cabecalhos.get("Content-Type", ""))
+        return resposta
+
+    try:
+        resposta = _baixar_monitorado(url, timeout, cabecalhos, max_bytes, ao_receber)
+    except Exception as e:
+        if acervo is not None:
+            acervo.registrar(url, erro=e)
+        raise
+    if acervo is not None:
+        acervo.registrar(url, resposta)
+    return resposta
+
+def estatisticas():
+    """Retorna os contadores de requisições, reuso de conexões e bytes recebidos do processo."""
+    with _lock:
+        dados = dict(_contadores)
+    dados["conexoes_reutilizadas"] = max(dados["requisicoes"] - dados["conexoes_novas"], 0)
+    return dados
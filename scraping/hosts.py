@@ -0,0 +1,139 @@
+"""
+Estado de saúde dos hosts acessados pelo scraping.
+
+Para cada host é mantido um histórico recente das latências (tempo até os
+cabeçalhos da resposta), usado para derivar timeouts de conexão e leitura mais
+justos que os valores fixos de 15/20 segundos, que passam a ser apenas o teto.
+O percentil 95 também define quando disparar uma requisição de hedge (ver
+`fetcher.baixar`).
+
+Há ainda um cache negativo de curta duração: URLs que falham repetidamente, ou
+hosts que acumulam falhas seguidas, são recusados de imediato durante alguns
+minutos, de modo que os critérios seguintes usem o fallback sem esperar outro
+timeout. Passado esse tempo, o registro de falhas é descartado.
+
+Num serviço de longa duração o estado não cresce sem limite: históricos e
+registros de falhas são mantidos só para os hosts/URLs usados mais recentemente.
+
+Configuração (variáveis de ambiente):
+- SCRAPING_TIMEOUT_ADAPTATIVO: "0" mantém os timeouts fixos (padrão ativado)
+- SCRAPING_FALHAS_TTL: segundos em que uma URL/host com falhas é evitado (padrão 120)
+- SCRAPING_HOSTS_MAX: hosts com histórico de latência e de falhas mantidos (padrão 1000)
+- SCRAPING_FALHAS_URLS_MAX: URLs com falhas registradas mantidas (padrão 5000)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+
+import requests
+
+from scraping import contexto
+
+TIMEOUT_ADAPTATIVO = os.getenv("SCRAPING_TIMEOUT_ADAPTATIVO", "1").lower() not in ("0", "false", "nao", "não")
+FALHAS_TTL = float(os.getenv("SCRAPING_FALHAS_TTL", 120))
+MAX_HOSTS = int(os.getenv("SCRAPING_HOSTS_MAX", 1000))
+MAX_URLS_FALHAS = int(os.getenv("SCRAPING_FALHAS_URLS_MAX", 5000))
+
+AMOSTRAS_POR_HOST = 50
+AMOSTRAS_MINIMAS = 5
+TIMEOUT_MINIMO = 2.0
+FALHAS_SEGUIDAS_URL = 2
+FALHAS_SEGUIDAS_HOST = 3
+
+class FalhaRecente(requests.RequestException):
+    """A URL ou o host falhou repetidamente há pouco tempo e está sendo evitado."""
+
+_lock = threading.Lock()
+# Em ordem de uso (o mais recente no fim), para descartar os mais antigos
+_latencias = OrderedDict()    # host -> deque de latências em segundos
+_falhas_url = OrderedDict()   # url -> (falhas seguidas, instante da última falha)
+_falhas_host = OrderedDict()  # host -> (falhas seguidas, instante da última falha)
+
+def _host(url):
+    return (urlsplit(url).hostname or "").lower()
+
+def _url(url):
+    partes = urlsplit(url)
+    return f"{_host(url)}{partes.path or '/'}?{partes.query}"
+
+def _limitar(registros, maximo):
+    while len(registros) > maximo:
+        registros.popitem(last=False)
+
+# --- Latências e timeouts ---
+def registrar_latencia(url, segundos):
+    host = _host(url)
+    with _lock:
+        _latencias.setdefault(host, deque(maxlen=AMOSTRAS_POR_HOST)).append(segundos)
+        _latencias.move_to_end(host)
+        _limitar(_latencias, MAX_HOSTS)
+
+def percentil(url, p):
+    """Percentil `p` (0-100) das latências recentes do host, ou None sem amostras suficientes."""
+    with _lock:
+        amostras = sorted(_latencias.get(_host(url), ()))
+    if len(amostras) < AMOSTRAS_MINIMAS:
+        return None
+    indice = min(len(amostras) - 1, int(round(p / 100 * (len(amostras) - 1))))
+    return amostras[indice]
+
+def timeouts(url, teto):
+    """
+    Retorna o timeout (conexão, leitura) para a URL, nunca acima de `teto`.
+    Sem histórico suficiente do host, usa o próprio teto.
+    """
+    p95 = percentil(url, 95) if TIMEOUT_ADAPTATIVO else None
+    if p95 is None:
+        return teto
+    conexao = min(teto, max(TIMEOUT_MINIMO, 3 * p95))
+    leitura = min(teto, max(TIMEOUT_MINIMO, 4 * p95))
+    return conexao, leitura
+
+# --- Cache negativo ---
+def _descartar_expiradas(falhas, agora):
+    # A ordem de inserção é a da última falha: as expiradas estão no início
+    while falhas:
+        chave, (_, instante) = next(iter(falhas.items()))
+        if agora - instante < FALHAS_TTL:
+            break
+        del falhas[chave]
+
+def verificar(url):
+    """Levanta FalhaRecente se a URL ou o host estiverem no cache negativo."""
+    agora = time.monotonic()
+    with _lock:
+        _descartar_expiradas(_falhas_url, agora)
+        _descartar_expiradas(_falhas_host, agora)
+        bloqueios = (
+            (_falhas_url.get(_url(url)), FALHAS_SEGUIDAS_URL, "URL"),
+            (_falhas_host.get(_host(url)), FALHAS_SEGUIDAS_HOST, "host"),
+        )
+        for registro, limite, alvo in bloqueios:
+            if registro and registro[0] >= limite:
+                contexto.contar("falhas_evitadas")
+                raise FalhaRecente(f"{alvo} com falhas recentes, acesso evitado: {url}")
+
+def _registrar(falhas, chave, agora, maximo):
+    quantidade, _ = falhas.pop(chave, (0, 0))
+    falhas[chave] = (quantidade + 1, agora)
+    _descartar_expiradas(falhas, agora)
+    _limitar(falhas, maximo)
+
+def registrar_falha(url, conexao=False):
+    """
+    Registra uma falha da URL. Falhas de conexão/timeout (`conexao=True`)
+    também contam para o host.
+    """
+    agora = time.monotonic()
+    with _lock:
+        _registrar(_falhas_url, _url(url), agora, MAX_URLS_FALHAS)
+        if conexao:
+            _registrar(_falhas_host, _host(url), agora, MAX_HOSTS)
+
+def registrar_sucesso(url):
+    with _lock:
+        _falhas_url.pop(_url(url), None)
+        _falhas_host.pop(_host(url), None)
@@ -9,15 +9,19 @@ Disponibilidade:
 Deve haver no site a apresentação da estrutura organizacional do órgão ou poder, de forma textual ou gráfica, deixando clara a hierarquia entre as unidades.
 """
 
-from bs4 import BeautifulSoup
+from ..paginas import Pagina
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+METADADOS = {
+    "codigo": "2.1",
+    "descricao": "Divulga a sua estrutura organizacional?",
+    "fundamento": "Art. 8º, §3º, I, da Lei nº 12.527/2011",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.1",
-        "descricao": "Divulga a sua estrutura organizacional?",
-        "fundamento": "Art. 8º, §3º, I, da Lei nº 12.527/2011",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -32,7 +36,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "secretarias", "departamentos", "chefia", "gabinete", "coordenação"
     ]
 
-    texto_visivel = soup.get_text(separator=" ", strip=True).lower()
+    texto_visivel = pagina.texto_minusculo
 
     for palavra in palavras_chave:
         if palavra in texto_visivel:
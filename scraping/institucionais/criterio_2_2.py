@@ -9,15 +9,19 @@ A página institucional contém seções com títulos como “Competências”,
 além de referências a cargos-chave com descrição funcional.
 """
 
-from bs4 import BeautifulSoup
+from ..paginas import Pagina
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+METADADOS = {
+    "codigo": "2.2",
+    "descricao": "Divulga competências e/ou atribuições?",
+    "fundamento": "Art. 8º, §1º, I, da Lei nº 12.527/2011 e art. 6º, VI, b, da Lei 13.460/2017",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.2",
-        "descricao": "Divulga competências e/ou atribuições?",
-        "fundamento": "Art. 8º, §1º, I, da Lei nº 12.527/2011 e art. 6º, VI, b, da Lei 13.460/2017",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -26,7 +30,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": "Não foram encontradas informações claras sobre competências institucionais."
     }
 
-    texto = soup.get_text(separator=" ", strip=True).lower()
+    texto = pagina.texto_minusculo
 
     palavras_chave = [
         "competência", "atribuições", "responsabilidades", 
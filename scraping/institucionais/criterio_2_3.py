@@ -8,16 +8,21 @@ Critério 2.3 – Identifica o nome dos atuais responsáveis pela gestão do Pod
 Nesta página (/institucional), identifica cargos como “Prefeito”, “Secretário (a)”, além
 de seções como “PREFEITO E VICE”, listando responsáveis com seus respectivos nomes.
 """
-from bs4 import BeautifulSoup
 import re
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "2.3",
+    "descricao": "Identifica o nome dos atuais responsáveis pela gestão do Poder/Órgão?",
+    "fundamento": "Art. 8º, §3º, I, da Lei nº 12.527/2011",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.3",
-        "descricao": "Identifica o nome dos atuais responsáveis pela gestão do Poder/Órgão?",
-        "fundamento": "Art. 8º, §3º, I, da Lei nº 12.527/2011",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -26,7 +31,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": "Nenhum responsável claramente identificado na página."
     }
 
-    texto = soup.get_text(separator="\n", strip=True)
+    texto = pagina.texto_linhas
     texto_lower = texto.lower()
 
     # Títulos indicativos estruturais
@@ -16,15 +16,20 @@ Para cumprimento mínimo, é necessário divulgar:
 """
 
 import re
-from bs4 import BeautifulSoup
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "2.4",
+    "descricao": "Divulga os endereços e telefones atuais do Poder ou órgão e e-mails institucionais?",
+    "fundamento": "Art. 8º, §1º, I, da Lei nº 12.527/2011 e art. 6º, VI, b, da Lei 13.460/2017",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.4",
-        "descricao": "Divulga os endereços e telefones atuais do Poder ou órgão e e-mails institucionais?",
-        "fundamento": "Art. 8º, §1º, I, da Lei nº 12.527/2011 e art. 6º, VI, b, da Lei 13.460/2017",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -33,7 +38,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": "Não foram encontrados todos os elementos obrigatórios (endereço, telefone, e-mail)."
     }
 
-    texto = soup.get_text(separator=" ", strip=True)
+    texto = pagina.texto
 
     # Expressões regulares para capturar os elementos
     padrao_telefone = re.compile(r'\(?\d{2}\)?\s?\d{4,5}[-\s]?\d{4}')
@@ -16,15 +16,20 @@ Exemplos válidos:
 """
 
 import re
-from bs4 import BeautifulSoup
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "2.5",
+    "descricao": "Divulga o horário de atendimento?",
+    "fundamento": "Art. 8º, §1º, I, da Lei nº 12.527/2011 e art. 6º, VI, b, da Lei 13.460/2017",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.5",
-        "descricao": "Divulga o horário de atendimento?",
-        "fundamento": "Art. 8º, §1º, I, da Lei nº 12.527/2011 e art. 6º, VI, b, da Lei 13.460/2017",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -33,7 +38,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": "Horário de atendimento não identificado na página."
     }
 
-    texto = soup.get_text(separator=" ", strip=True).lower()
+    texto = pagina.texto_minusculo
 
     # Padrões comuns de horário
     padrao_horario = re.compile(r"(das?\\s*\\d{1,2}[:h]?\\d{0,2}\\s*(às|as|a)\\s*\\d{1,2}[:h]?\\d{0,2})")
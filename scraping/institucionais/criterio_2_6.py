@@ -14,16 +14,21 @@ Requisitos:
 """
 
 import re
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "2.6",
+    "descricao": "Divulga os atos normativos próprios?",
+    "fundamento": "Art. 37 da CF; Lei nº 12.527/2011, arts. 3º, 6º, 7º e 8º",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.6",
-        "descricao": "Divulga os atos normativos próprios?",
-        "fundamento": "Art. 37 da CF; Lei nº 12.527/2011, arts. 3º, 6º, 7º e 8º",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": False,
         "serie_historica": False,
@@ -32,8 +37,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": "Atos normativos não foram detectados com clareza."
     }
 
-    texto = soup.get_text(separator=" ", strip=True).lower()
-    html_lower = html.lower()
+    texto = pagina.texto_minusculo
 
     # Verifica disponibilidade de termos normativos
     termos_normativos = ["decreto", "portaria", "resolução", "instrução normativa", "lei municipal"]
@@ -60,7 +64,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         resultado["serie_historica"] = True
 
     # Verifica se há campo de filtro na página
-    filtros = soup.find_all("input", {"type": "text"})
+    filtros = [campo for campo in pagina.inputs if campo.get("type") == "text"]
     for f in filtros:
         if "busca" in f.get("name", "").lower() or "filtro" in f.get("name", "").lower():
             resultado["filtro"] = True
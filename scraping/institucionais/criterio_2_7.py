@@ -12,15 +12,19 @@ Requisitos:
 - Respostas devem trazer informações práticas ao cidadão
 """
 
-from bs4 import BeautifulSoup
+from ..paginas import Pagina
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+METADADOS = {
+    "codigo": "2.7",
+    "descricao": "Divulga perguntas e respostas mais frequentes?",
+    "fundamento": "Art. 8º, §1º, I, da Lei nº 12.527/2011",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.7",
-        "descricao": "Divulga perguntas e respostas mais frequentes?",
-        "fundamento": "Art. 8º, §1º, I, da Lei nº 12.527/2011",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -29,15 +33,15 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": "Não foram encontradas perguntas e respostas frequentes com conteúdo relevante."
     }
 
-    texto = soup.get_text(separator=" ", strip=True).lower()
+    texto = pagina.texto_minusculo
 
     if "sem perguntas frequentes" in texto:
         resultado["justificativa"] = "Página exibe mensagem padrão de ausência: 'Sem perguntas frequentes'."
         return resultado
 
     # Busca blocos de perguntas com formatação comum
-    perguntas = [tag for tag in soup.find_all("a") if tag.get_text(strip=True).startswith("1.")]
-    respostas = soup.find_all("div", class_="resposta")
+    perguntas = [tag for tag in pagina.soup.find_all("a") if tag.get_text(strip=True).startswith("1.")]
+    respostas = pagina.soup.find_all("div", class_="resposta")
 
     if len(perguntas) >= 3 and len(respostas) >= 3:
         resultado["disponibilidade"] = True
@@ -11,15 +11,19 @@ Requisitos:
 - Plataformas válidas: Facebook, Instagram, Twitter, WhatsApp, TikTok, etc.
 """
 
-from bs4 import BeautifulSoup
+from ..paginas import Pagina
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+METADADOS = {
+    "codigo": "2.8",
+    "descricao": "Participa em redes sociais e apresenta link no site?",
+    "fundamento": "Lei nº 12.527/2011, arts. 3º, 6º e 8º",
+    "classificacao": "recomendada",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.8",
-        "descricao": "Participa em redes sociais e apresenta link no site?",
-        "fundamento": "Lei nº 12.527/2011, arts. 3º, 6º e 8º",
-        "classificacao": "recomendada",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -31,9 +35,8 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
     redes = ["facebook.com", "instagram.com", "twitter.com", "tiktok.com", "whatsapp.com"]
     encontrados = []
 
-    links = soup.find_all("a", href=True)
-    for link in links:
-        href = link['href'].lower()
+    for link in pagina.links:
+        href = link.href.lower()
         for rede in redes:
             if rede in href:
                 encontrados.append(href)
@@ -11,15 +11,19 @@ Requisitos:
 - O link deve estar em local de fácil acesso, visível no primeiro nível da navegação.
 """
 
-from bs4 import BeautifulSoup
+from ..paginas import Pagina
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+METADADOS = {
+    "codigo": "2.9",
+    "descricao": "Inclui botão do Radar da Transparência Pública no site institucional ou portal transparência?",
+    "fundamento": "Art. 37 da CF e art. 3º da Lei nº 12.527/2011",
+    "classificacao": "recomendada",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "2.9",
-        "descricao": "Inclui botão do Radar da Transparência Pública no site institucional ou portal transparência?",
-        "fundamento": "Art. 37 da CF e art. 3º da Lei nº 12.527/2011",
-        "classificacao": "recomendada",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -28,9 +32,8 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": "Nenhum link para o Radar da Transparência Pública foi encontrado na página."
     }
 
-    links = soup.find_all("a", href=True)
-    for link in links:
-        href = link['href'].lower()
+    for link in pagina.links:
+        href = link.href.lower()
         if "radardatransparencia.atricon.org.br" in href:
             resultado["disponibilidade"] = True
             resultado["justificativa"] = f"Link encontrado: {href}"
@@ -1,14 +1,14 @@
 """
 Módulo de execução dos critérios do domínio 'institucionais' (2.1 a 2.9)
 
-Este manager recebe o HTML e soup da página principal de acesso à informação
-e tenta encontrar os links corretos para cada critério com base em palavras-chave.
-Cada link é acessado individualmente e enviado para o avaliador correspondente.
+Este manager declara os grupos de palavras-chave que localizam, na `Pagina`
+principal de acesso à informação, os links de cada critério (em `scraping.descoberta`)
+e a página lida por cada critério (em `scraping.registro`). O download das
+subpáginas e a avaliação ficam a cargo de `scraping.execucao`.
 """
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from .. import descoberta, execucao, registro
+from ..paginas import Pagina
 
 from .criterio_2_1 import avaliar as avaliar_2_1
 from .criterio_2_2 import avaliar as avaliar_2_2
@@ -20,77 +20,26 @@ from .criterio_2_7 import avaliar as avaliar_2_7
 from .criterio_2_8 import avaliar as avaliar_2_8
 from .criterio_2_9 import avaliar as avaliar_2_9
 
-def encontrar_link_por_palavra(soup, palavras):
-    """Procura o primeiro link (href) cujo texto ou href contenha qualquer palavra-chave"""
-    links = soup.find_all("a", href=True)
-    for link in links:
-        texto_completo = " ".join(link.stripped_strings).lower()
-        href = link['href'].lower()
-        for palavra in palavras:
-            if palavra in texto_completo or palavra in href:
-                return link['href']
-    return None
-
-def carregar_subpagina(base_url, caminho):
-    """Carrega o HTML e Soup de uma subpágina"""
-    url_completa = urljoin(base_url, caminho)
-    response = requests.get(url_completa, timeout=15)
-    response.raise_for_status()
-    html = response.text
-    soup = BeautifulSoup(html, "html.parser")
-    return html, soup, url_completa
-
-def avaliar(html: str, soup: BeautifulSoup, url_base: str) -> list:
-    resultados = []
-
-    # Critérios 2.1 a 2.3 → página institucional ou fallback
-    link_inst = encontrar_link_por_palavra(soup, ["institucional"])
-    if link_inst:
-        try:
-            html_inst, soup_inst, url_inst = carregar_subpagina(url_base, link_inst)
-        except:
-            html_inst, soup_inst, url_inst = html, soup, url_base
-    else:
-        html_inst, soup_inst, url_inst = html, soup, url_base
-
-    resultados.append(avaliar_2_1(html_inst, soup_inst, url_inst))
-    resultados.append(avaliar_2_2(html_inst, soup_inst, url_inst))
-    resultados.append(avaliar_2_3(html_inst, soup_inst, url_inst))
-
-    # Critério 2.4 → reutiliza institucional
-    resultados.append(avaliar_2_4(html_inst, soup_inst, url_inst))
-
-    # Critério 2.5 → reutiliza institucional
-    resultados.append(avaliar_2_5(html_inst, soup_inst, url_inst))
-
-    # Critério 2.6 → normativos próprios ou fallback
-    link_norma = encontrar_link_por_palavra(soup, ["normativo", "atos"])
-    if link_norma:
-        try:
-            html_norma, soup_norma, url_norma = carregar_subpagina(url_base, link_norma)
-        except:
-            html_norma, soup_norma, url_norma = html, soup, url_base
-    else:
-        html_norma, soup_norma, url_norma = html, soup, url_base
-
-    resultados.append(avaliar_2_6(html_norma, soup_norma, url_norma))
-
-    # Critério 2.7 → perguntas frequentes ou fallback
-    link_faq = encontrar_link_por_palavra(soup, ["pergunta", "faq"])
-    if link_faq:
-        try:
-            html_faq, soup_faq, url_faq = carregar_subpagina(url_base, link_faq)
-        except:
-            html_faq, soup_faq, url_faq = html, soup, url_base
-    else:
-        html_faq, soup_faq, url_faq = html, soup, url_base
-
-    resultados.append(avaliar_2_7(html_faq, soup_faq, url_faq))
-
-    # Critério 2.8 → redes sociais no próprio soup da página principal
-    resultados.append(avaliar_2_8(html, soup, url_base))
-
-    # Critério 2.9 → radar da transparência (busca link no HTML base)
-    resultados.append(avaliar_2_9(html, soup, url_base))
-
-    return resultados
+# Timeout (s) do download de cada subpágina do domínio
+TIMEOUT_SUBPAGINA = 15
+
+# Primeiro link cujo texto ou href contenha qualquer palavra-chave do grupo
+descoberta.registrar("institucionais", "institucional", ["institucional"], href=True, timeout=TIMEOUT_SUBPAGINA)
+descoberta.registrar("institucionais", "normativos", ["normativo", "atos"], href=True, timeout=TIMEOUT_SUBPAGINA)
+descoberta.registrar("institucionais", "faq", ["pergunta", "faq"], href=True, timeout=TIMEOUT_SUBPAGINA)
+
+# Critério, página lida (grupo de links acima) e, na falta dela, a página inicial
+# depende_da_data: a atualidade é medida a partir da data da avaliação
+registro.registrar("2.1", "institucionais", avaliar_2_1, pagina="institucional")
+registro.registrar("2.2", "institucionais", avaliar_2_2, pagina="institucional")
+registro.registrar("2.3", "institucionais", avaliar_2_3, pagina="institucional")
+registro.registrar("2.4", "institucionais", avaliar_2_4, pagina="institucional")
+registro.registrar("2.5", "institucionais", avaliar_2_5, pagina="institucional")
+registro.registrar("2.6", "institucionais", avaliar_2_6, pagina="normativos", depende_da_data=True)
+registro.registrar("2.7", "institucionais", avaliar_2_7, pagina="faq")
+registro.registrar("2.8", "institucionais", avaliar_2_8)  # redes sociais na própria página principal
+registro.registrar("2.9", "institucionais", avaliar_2_9)  # radar da transparência (link na página principal)
+
+def avaliar(pagina: Pagina) -> list:
+    """Avalia os critérios do domínio 'institucionais' (ver `scraping.execucao`). None se algum falhar."""
+    return execucao.executar(pagina, ["institucionais"]).get("institucionais")
@@ -0,0 +1,141 @@
+"""
+Acompanhamento do uso de memória durante as análises.
+
+Enquanto houver análises em andamento, uma única thread amostra periodicamente a
+memória do processo: a alocada pelo Python, via `tracemalloc`, se o rastreamento
+estiver ativado; senão o RSS lido de /proc (Linux). A medida é do processo
+inteiro, não de cada análise: com análises simultâneas, cada uma vê também a
+memória das outras. Por isso as métricas levam o prefixo `memoria_processo_`: o
+pico do processo enquanto a análise rodava e o quanto ele cresceu desde o início
+dela.
+
+Com um teto configurado, uma amostra acima dele faz a próxima análise que tentar
+alocar mais (baixar, montar uma árvore ou rodar um critério) ser interrompida
+com `MemoriaExcedida`, em vez de o processo ser encerrado pelo sistema por falta
+de memória. Só uma análise é interrompida por vez: as demais seguem, e outra só é
+interrompida se o processo continuar acima do teto depois de um intervalo de
+carência, dado para a memória da interrompida ser devolvida.
+
+Configuração (variáveis de ambiente):
+- SCRAPING_MEMORIA_RASTREAR: "1" ativa o `tracemalloc` (mais preciso, porém mais lento; padrão "0")
+- SCRAPING_MEMORIA_INTERVALO_MS: intervalo entre amostras (padrão 50)
+- SCRAPING_MEMORIA_MAXIMA_MB: teto de memória do processo; 0 desativa (padrão 0)
+- SCRAPING_MEMORIA_CARENCIA_MS: intervalo mínimo entre duas interrupções (padrão 1000)
+"""
+
+import os
+import threading
+import time
+import tracemalloc
+
+from scraping import contexto
+
+RASTREAR = os.getenv("SCRAPING_MEMORIA_RASTREAR", "0") == "1"
+INTERVALO_MS = int(os.getenv("SCRAPING_MEMORIA_INTERVALO_MS", 50))
+MAXIMA_MB = float(os.getenv("SCRAPING_MEMORIA_MAXIMA_MB", 0))
+CARENCIA_MS = int(os.getenv("SCRAPING_MEMORIA_CARENCIA_MS", 1000))
+
+class MemoriaExcedida(RuntimeError):
+    """A memória do processo passou do teto configurado durante a análise."""
+
+def _uso_atual():
+    """Memória atual do processo em bytes, ou None se não houver como medir."""
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+class Acompanhamento:
+    """Memória do processo vista por uma análise (ver `iniciar`)."""
+
+    def __init__(self, url, uso):
+        self.url = url
+        self.inicial = uso
+        self.pico = uso
+        self.excedida = None
+
+    def encerrar(self):
+        _amostrador.remover(self)
+
+    def metricas(self) -> dict:
+        if self.pico is None:
+            return {}
+        return {
+            "memoria_processo_pico_kb": self.pico // 1024,
+            "memoria_processo_acrescimo_kb": max(self.pico - self.inicial, 0) // 1024,
+        }
+
+class _Amostrador:
+    """Thread única de amostragem, ativa enquanto houver análises acompanhadas."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._acompanhamentos = set()
+        self._thread = None
+        self.uso = None
+        self._proxima_interrupcao = 0.0
+
+    def adicionar(self, acompanhamento):
+        with self._lock:
+            self._acompanhamentos.add(acompanhamento)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._amostrar, daemon=True)
+                self._thread.start()
+
+    def remover(self, acompanhamento):
+        with self._lock:
+            self._acompanhamentos.discard(acompanhamento)
+
+    def _amostrar(self):
+        while True:
+            time.sleep(INTERVALO_MS / 1000)
+            uso = _uso_atual()
+            with self._lock:
+                if uso is None or not self._acompanhamentos:
+                    self._thread = None
+                    self.uso = None
+                    return
+                self.uso = uso
+                for acompanhamento in self._acompanhamentos:
+                    acompanhamento.pico = max(acompanhamento.pico or 0, uso)
+
+    def acima_do_teto(self):
+        return bool(MAXIMA_MB) and self.uso is not None and self.uso > MAXIMA_MB * 1024 * 1024
+
+    def interromper(self, acompanhamento):
+        """Marca a análise como excedida, se nenhuma outra foi interrompida durante a carência."""
+        with self._lock:
+            agora = time.monotonic()
+            if acompanhamento.excedida is None and agora >= self._proxima_interrupcao:
+                self._proxima_interrupcao = agora + CARENCIA_MS / 1000
+                acompanhamento.excedida = MemoriaExcedida(
+                    f"[ERRO] Análise de {acompanhamento.url} interrompida: memória do processo "
+                    f"({self.uso / 2**20:.0f} MB) acima do teto de {MAXIMA_MB:.0f} MB."
+                )
+            return acompanhamento.excedida
+
+_amostrador = _Amostrador()
+
+def iniciar(url):
+    """Acompanhamento da análise de `url`, ou None se estiver desativado."""
+    if not RASTREAR and not MAXIMA_MB:
+        return None
+    if RASTREAR and not tracemalloc.is_tracing():
+        tracemalloc.start(1)
+    acompanhamento = Acompanhamento(url, _uso_atual())
+    _amostrador.adicionar(acompanhamento)
+    return acompanhamento
+
+def verificar():
+    """Levanta `MemoriaExcedida` se a análise em andamento foi escolhida para liberar memória."""
+    analise = contexto.atual()
+    acompanhamento = getattr(analise, "memoria", None)
+    if acompanhamento is None:
+        return
+    if acompanhamento.excedida is None and _amostrador.acima_do_teto():
+        _amostrador.interromper(acompanhamento)
+    if acompanhamento.excedida is not None:
+        raise acompanhamento.excedida
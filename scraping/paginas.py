@@ -0,0 +1,422 @@
+"""
+Carregamento das páginas usadas pelos managers de domínio.
+
+Toda página (inicial, subpáginas e iframes) é carregada por `carregar_pagina`,
+que retorna um objeto `Pagina`. Dentro de uma análise, as páginas ficam num
+registro indexado pela URL absoluta normalizada: pedidos simultâneos ou repetidos
+da mesma página compartilham um único download e um único parse (ver
+`scraping.parsers`). Entre análises, as respostas passam pelo cache persistente
+de `scraping.cache`.
+
+A `Pagina` calcula sob demanda, uma única vez, as características que os
+critérios consultam (texto visível, links, campos de formulário, iframes,
+tabelas e os sinais de `scraping.sinais`), em vez de cada critério refazer o
+mesmo `get_text`/`find_all`. A própria árvore do parser só é construída quando
+alguma dessas características (ou `pagina.soup`) é pedida: critérios que leem
+apenas a URL ou o HTML bruto nunca disparam o parse, sem precisar declarar nada.
+O parser recebe o HTML sem o conteúdo de scripts, estilos, SVGs e
+data-URIs (ver `scraping.sanitizacao`); `pagina.html` mantém o original.
+
+Quais páginas são carregadas, e para quais critérios, é decidido por
+`scraping.execucao` a partir dos critérios declarados em `scraping.registro`.
+
+Os critérios são executados por `avaliar_criterio`, que acrescenta à justificativa
+um aviso quando alguma página lida pelo critério foi truncada no download.
+
+Links, campos (<input>) e iframes são lidos de um parse parcial, que guarda só
+essas tags, enquanto a árvore completa não tiver sido construída. Assim a
+descoberta de links na página inicial (caminho crítico até as subpáginas) não
+espera o parse completo, e páginas usadas só para navegação nunca o fazem.
+
+A árvore do parser é a parte mais pesada de uma página. Quem avalia vários
+critérios sobre a mesma página a mantém viva com `Pagina.em_uso()`; quando o
+último usuário sai, a árvore e os nós guardados dela são descartados, ficando só
+os textos, links e sinais já calculados. As páginas carregadas dentro de um
+critério (ex.: iframes) são liberadas ao fim dele, e as demais ao fim da análise.
+
+Configuração (variáveis de ambiente):
+- SCRAPING_PARSE_PARCIAL: "0" lê links e campos sempre da árvore completa (padrão ativado)
+"""
+
+import contextvars
+import hashlib
+import os
+import threading
+import unicodedata
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import NamedTuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from scraping import (
+    cache, concorrencia, conteudo, contexto, decodificacao, fetcher, memoria, parsers, reproducao, sanitizacao, sinais,
+)
+
+PARSE_PARCIAL = os.getenv("SCRAPING_PARSE_PARCIAL", "1").lower() not in ("0", "false", "nao", "não")
+
+# Tags mantidas no parse parcial (ver Pagina.links, inputs e iframes)
+TAGS_NAVEGACAO = ("a", "iframe", "input")
+
+# Características descartadas com a árvore: as que guardam nós do parser (e, por
+# eles, a árvore inteira) e o HTML limpo entregue a ele
+CARACTERISTICAS_ARVORE = ("soup", "_navegacao", "inputs", "iframes", "tabelas", "html_analisado")
+
+# URLs das páginas lidas pelo critério em execução (ver avaliar_criterio)
+_paginas_do_criterio = contextvars.ContextVar("paginas_do_criterio", default=None)
+# Páginas já carregadas de que o resultado do critério em execução depende (ver registrar_dependencia)
+_dependencias_do_criterio = contextvars.ContextVar("dependencias_do_criterio", default=None)
+
+_PORTAS_PADRAO = {"http": 80, "https": 443}
+
+def normalizar_url(url):
+    """Normaliza uma URL absoluta para uso como chave (esquema/host minúsculos, sem fragmento)."""
+    partes = urlsplit(url.strip())
+    esquema = partes.scheme.lower()
+    host = (partes.hostname or "").lower()
+    porta = partes.port
+    netloc = host if porta is None or _PORTAS_PADRAO.get(esquema) == porta else f"{host}:{porta}"
+    return urlunsplit((esquema, netloc, partes.path or "/", partes.query, ""))
+
+def normalizar_texto(texto):
+    """Remove acentos e converte para minúsculas."""
+    return unicodedata.normalize("NFKD", texto).encode("ASCII", "ignore").decode("ASCII").lower()
+
+class Link(NamedTuple):
+    """Link <a href> de uma página."""
+    href: str
+    textos: tuple  # trechos de texto da âncora, sem espaços nas pontas
+    url: str       # href resolvido contra a URL da página
+
+    @property
+    def texto(self):
+        return " ".join(self.textos)
+
+class Pagina:
+    """
+    Página carregada: URL e HTML decodificado, mais a árvore do parser e as
+    características usadas pelos critérios, calculadas no primeiro acesso e
+    memorizadas para os critérios seguintes.
+    """
+
+    def __init__(self, url, html, soup=None, hash_corpo=None):
+        self.url = url
+        self.html = html
+        self._hash_corpo = hash_corpo
+        self._memo = {}
+        self._lock = threading.RLock()
+        self._usos = 0
+        self.parses = 0  # quantas vezes a árvore completa foi construída
+        if soup is not None:
+            self.__dict__["soup"] = soup
+            self.parses = 1
+
+    @property
+    def analisada(self):
+        """Se a árvore do parser está construída (e não foi liberada)."""
+        return "soup" in self.__dict__
+
+    @contextmanager
+    def em_uso(self):
+        """Mantém a árvore do parser viva durante o bloco; o último a sair a libera."""
+        with self._lock:
+            self._usos += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._usos -= 1
+            self.liberar_arvore()
+
+    def liberar_arvore(self):
+        """
+        Descarta a árvore do parser e as características que guardam nós dela, se
+        ninguém estiver usando a página. Se for pedida de novo, é reconstruída.
+        """
+        with self._lock:
+            if self._usos or not any(nome in self.__dict__ for nome in CARACTERISTICAS_ARVORE):
+                return
+            for nome in CARACTERISTICAS_ARVORE:
+                self.__dict__.pop(nome, None)
+        contexto.contar("arvores_liberadas")
+
+    def na_url(self, url):
+        """A mesma página vista a partir de outra URL (os links dependem dela)."""
+        if url == self.url:
+            return self
+        return Pagina(url, self.html, self.__dict__.get("soup"), self._hash_corpo)
+
+    @property
+    def hash(self):
+        """SHA-256 do corpo baixado (ou, na falta dele, do HTML), para comparar versões da página."""
+        if self._hash_corpo is None:
+            self._hash_corpo = hashlib.sha256(self.html.encode("utf-8", "surrogatepass")).hexdigest()
+        return self._hash_corpo
+
+    def memorizado(self, chave, calcular):
+        """Valor derivado da página por outro módulo, calculado uma única vez por chave."""
+        with self._lock:
+            if chave not in self._memo:
+                self._memo[chave] = calcular()
+            return self._memo[chave]
+
+    @concorrencia.memorizada
+    def html_analisado(self):
+        """HTML entregue ao parser, sem scripts, estilos e outros volumes (ver `scraping.sanitizacao`)."""
+        return sanitizacao.sanitizar(self.html, self.url)
+
+    @concorrencia.memorizada
+    def soup(self):
+        """Árvore do parser configurado (ver `scraping.parsers`), construída no primeiro acesso."""
+        memoria.verificar()
+        contexto.contar("paginas_analisadas")
+        self.parses += 1
+        return parsers.analisar(self.html_analisado)
+
+    @concorrencia.memorizada
+    def texto(self):
+        """Texto visível, com os trechos separados por espaço."""
+        return self.soup.get_text(separator=" ", strip=True)
+
+    @property
+    def texto_principal(self):
+        """Texto visível sem os blocos de modelo do portal (ver `scraping.conteudo`)."""
+        return conteudo.texto_principal(self)
+
+    @concorrencia.memorizada
+    def texto_minusculo(self):
+        return self.texto.lower()
+
+    @concorrencia.memorizada
+    def texto_normalizado(self):
+        """Texto visível em minúsculas e sem acentos."""
+        return normalizar_texto(self.texto)
+
+    @concorrencia.memorizada
+    def texto_linhas(self):
+        """Texto visível com um trecho por linha."""
+        return self.soup.get_text(separator="\n", strip=True)
+
+    @concorrencia.memorizada
+    def _navegacao(self):
+        """Árvore com apenas links, campos e iframes; a completa, se já existir."""
+        if self.analisada or not PARSE_PARCIAL or not parsers.parse_parcial_disponivel():
+            return self.soup
+        contexto.contar("paginas_parse_parcial")
+        return parsers.analisar(self.html_analisado, somente=TAGS_NAVEGACAO)
+
+    @concorrencia.memorizada
+    def links(self):
+        return [
+            Link(a["href"], tuple(a.stripped_strings), urljoin(self.url, a["href"]))
+            for a in self._navegacao.find_all("a", href=True)
+        ]
+
+    @concorrencia.memorizada
+    def inputs(self):
+        return self._navegacao.find_all("input")
+
+    @concorrencia.memorizada
+    def iframes(self):
+        return self._navegacao.find_all("iframe")
+
+    @concorrencia.memorizada
+    def tabelas(self):
+        return self.soup.find_all("table")
+
+    @concorrencia.memorizada
+    def sinais(self):
+        """Sinais temporais e de exportação (ver `scraping.sinais`)."""
+        return sinais.Sinais(self)
+
+class RegistroPaginas:
+    """
+    Páginas carregadas em uma análise, com carga única por URL (single-flight).
+
+    O primeiro pedido de uma URL executa a carga; pedidos concorrentes ou
+    posteriores aguardam e recebem o mesmo resultado (ou a mesma exceção). A
+    espera respeita o prazo de quem aguarda, e uma carga interrompida por prazo
+    não fica registrada: o próximo pedido tenta de novo, com o próprio prazo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self.downloads = 0
+        self.reaproveitadas = 0
+        self.truncadas = {}
+
+    def obter(self, url, carregar):
+        chave = normalizar_url(url)
+        with self._lock:
+            futuro = self._entradas.get(chave)
+            responsavel = futuro is None
+            if responsavel:
+                futuro = Future()
+                self._entradas[chave] = futuro
+                self.downloads += 1
+            else:
+                self.reaproveitadas += 1
+
+        if responsavel:
+            try:
+                futuro.set_result(carregar(url))
+            except BaseException as e:
+                if isinstance(e, contexto.PrazoEsgotado):
+                    with self._lock:
+                        self._entradas.pop(chave, None)
+                futuro.set_exception(e)
+            return futuro.result()
+
+        try:
+            return futuro.result(timeout=contexto.restante())
+        except TimeoutError:
+            if futuro.done():
+                raise
+            raise contexto.PrazoEsgotado(f"Prazo esgotado aguardando {url}.")
+
+    def registrar_truncamento(self, url, bytes_lidos):
+        with self._lock:
+            self.truncadas[normalizar_url(url)] = bytes_lidos
+
+    def nao_analisadas(self):
+        """Quantidade de páginas carregadas cuja árvore do parser nunca foi construída."""
+        with self._lock:
+            futuros = list(self._entradas.values())
+        return sum(
+            1 for futuro in futuros
+            if futuro.done() and futuro.exception() is None and not futuro.result().parses
+        )
+
+    def carregada(self, url):
+        """A `Pagina` da URL, se já foi carregada com sucesso; None caso contrário."""
+        with self._lock:
+            futuro = self._entradas.get(normalizar_url(url))
+        if futuro is None or not futuro.done() or futuro.exception() is not None:
+            return None
+        return futuro.result()
+
+    def liberar_arvores(self):
+        """Libera a árvore de todas as páginas carregadas que ninguém está usando."""
+        with self._lock:
+            urls = list(self._entradas)
+        for url in urls:
+            pagina = self.carregada(url)
+            if pagina is not None:
+                pagina.liberar_arvore()
+
+    def truncamento(self, url):
+        """Bytes lidos da página, se ela foi truncada; None caso contrário."""
+        with self._lock:
+            return self.truncadas.get(normalizar_url(url))
+
+def _analisar(url, corpo, codificacao, hash_corpo, memorizar=True):
+    def decodificar():
+        return decodificacao.decodificar(corpo, codificacao)
+    html = cache.texto_memorizado(f"{hash_corpo}:{codificacao}", decodificar) if memorizar else decodificar()
+    # Uma Pagina nova por análise; o parse em si é adiado até o primeiro uso (ver Pagina.soup)
+    return Pagina(url, html, hash_corpo=hash_corpo)
+
+def _baixar_pagina(url, timeout, ao_receber=None):
+    chave = normalizar_url(url)
+    # Com um acervo de gravação/reprodução ativo, toda página passa pelo fetcher
+    usar_cache = reproducao.atual() is None
+    entrada = cache.consultar(chave) if usar_cache else None
+    if entrada is not None and entrada.fresca:
+        contexto.contar("cache_validas")
+        return _analisar(url, entrada.corpo, entrada.codificacao, entrada.hash_corpo)
+
+    cabecalhos = entrada.cabecalhos_condicionais() if entrada is not None else None
+    resposta = fetcher.baixar(url, timeout=timeout, cabecalhos=cabecalhos, ao_receber=ao_receber)
+    if resposta.status == 304 and entrada is not None:
+        cache.renovar(chave)
+        contexto.contar("cache_revalidadas")
+        return _analisar(url, entrada.corpo, entrada.codificacao, entrada.hash_corpo)
+
+    contexto.contar("cache_ausentes")
+    hash_corpo = hashlib.sha256(resposta.corpo).hexdigest()
+    codificacao, _ = decodificacao.detectar(resposta.corpo, resposta.cabecalhos.get("Content-Type", ""))
+    if resposta.truncada:
+        # Páginas truncadas não vão para o cache, para não servir conteúdo parcial depois
+        analise = contexto.atual()
+        if analise is not None:
+            analise.paginas.registrar_truncamento(url, len(resposta.corpo))
+        contexto.contar("paginas_truncadas")
+    elif usar_cache:
+        cache.armazenar(chave, resposta.corpo, codificacao, resposta.cabecalhos, hash_corpo)
+    return _analisar(url, resposta.corpo, codificacao, hash_corpo, memorizar=usar_cache)
+
+def carregar_pagina(url, timeout=15, ao_receber=None):
+    """
+    Retorna a `Pagina` da URL. Dentro de uma análise, reutiliza a página se
+    ela já tiver sido (ou estiver sendo) carregada.
+
+    `ao_receber` recebe os blocos do corpo durante o download (ver `fetcher.baixar`).
+    """
+    consultadas = _paginas_do_criterio.get()
+    if consultadas is not None:
+        consultadas.append(url)
+
+    memoria.verificar()
+    timeout = contexto.limitar_timeout(timeout)
+    analise = contexto.atual()
+    if analise is None:
+        return _baixar_pagina(url, timeout, ao_receber)
+    return analise.paginas.obter(url, lambda u: _baixar_pagina(u, timeout, ao_receber))
+
+def registrar_dependencia(pagina):
+    """
+    Registra que o critério em execução depende de uma página que ele não carregou
+    (ex.: a página inicial, usada por `scraping.conteudo` para retirar o modelo do
+    portal), para que ela entre nas páginas de entrada do resultado.
+    """
+    dependencias = _dependencias_do_criterio.get()
+    if dependencias is not None:
+        dependencias.append(pagina)
+
+def avaliar_criterio(avaliar, pagina, entrada=None):
+    """
+    Executa a função `avaliar` de um critério sobre a página informada.
+
+    Se a página, ou outra carregada pelo próprio critério (ex.: iframe), tiver
+    sido truncada no download, o fato é registrado na justificativa do resultado.
+    As páginas que o próprio critério carregou têm a árvore liberada ao final.
+    Se `entrada` (lista) for informada, recebe [url, hash] de cada página lida,
+    inclusive as registradas com `registrar_dependencia`.
+    """
+    memoria.verificar()
+    consultadas = [pagina.url]
+    dependencias = []
+    token = _paginas_do_criterio.set(consultadas)
+    token_dependencias = _dependencias_do_criterio.set(dependencias)
+    try:
+        resultado = avaliar(pagina)
+    finally:
+        _paginas_do_criterio.reset(token)
+        _dependencias_do_criterio.reset(token_dependencias)
+
+    analise = contexto.atual()
+    if analise is not None:
+        avisos = []
+        for pagina_url in dict.fromkeys(consultadas):
+            bytes_lidos = analise.paginas.truncamento(pagina_url)
+            if bytes_lidos is not None:
+                avisos.append(f"Página truncada: apenas os primeiros {bytes_lidos} bytes de {pagina_url} foram analisados.")
+        if avisos:
+            resultado["justificativa"] = " | ".join(filter(None, [resultado.get("justificativa")] + avisos))
+
+        for pagina_url in dict.fromkeys(consultadas[1:]):
+            carregada = analise.paginas.carregada(pagina_url)
+            if carregada is not None and carregada is not pagina:
+                carregada.liberar_arvore()
+
+    if entrada is not None:
+        for pagina_url in dict.fromkeys(consultadas):
+            carregada = pagina if pagina_url == pagina.url else (analise and analise.paginas.carregada(pagina_url))
+            # Página que falhou ao carregar fica sem hash: o resultado nunca é reaproveitado
+            entrada.append([pagina_url, carregada.hash if carregada is not None else None])
+        lidas = {pagina_url for pagina_url, _ in entrada}
+        for dependencia in dependencias:
+            if dependencia.url not in lidas:
+                lidas.add(dependencia.url)
+                entrada.append([dependencia.url, dependencia.hash])
+    return resultado
@@ -0,0 +1,152 @@
+"""
+Backends de parse de HTML usados pelo scraping.
+
+O backend é escolhido pela variável de ambiente SCRAPING_PARSER:
+- "html.parser" (padrão): BeautifulSoup com o parser puro Python da biblioteca padrão;
+- "lxml": BeautifulSoup com o parser em C do lxml (mesma API, parse bem mais rápido);
+- "selectolax": parser lexbor via selectolax, exposto por um adaptador com o
+  subconjunto da API do BeautifulSoup que os critérios usam (`find_all`, `find`,
+  `get_text`, `stripped_strings`, acesso a atributos).
+
+Se o backend configurado não estiver instalado, usa-se "html.parser" com um aviso.
+
+`analisar(html, somente=[...])` faz um parse parcial, que guarda apenas as tags
+indicadas (e seu conteúdo) por meio de um SoupStrainer: bem mais barato quando só
+interessam links e campos. O adaptador do selectolax não tem esse modo (o parse
+completo já é rápido); use `parse_parcial_disponivel()` para saber se vale a pena.
+"""
+
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+BACKENDS = ("html.parser", "lxml", "selectolax")
+PARSER = os.getenv("SCRAPING_PARSER", "html.parser")
+
+# Conteúdo que o BeautifulSoup não considera texto visível em get_text()
+_TAGS_SEM_TEXTO = {"script", "style", "template"}
+
+def _backend_disponivel(nome):
+    if nome == "html.parser":
+        return True
+    try:
+        if nome == "lxml":
+            import lxml  # noqa: F401
+        elif nome == "selectolax":
+            import selectolax.lexbor  # noqa: F401
+        else:
+            return False
+    except ImportError:
+        return False
+    return True
+
+def _backend_padrao():
+    if PARSER not in BACKENDS:
+        print(f"[AVISO] Parser '{PARSER}' desconhecido; usando 'html.parser'.")
+        return "html.parser"
+    if not _backend_disponivel(PARSER):
+        print(f"[AVISO] Parser '{PARSER}' não está instalado; usando 'html.parser'.")
+        return "html.parser"
+    return PARSER
+
+BACKEND = _backend_padrao()
+
+def parse_parcial_disponivel(backend=None):
+    return (backend or BACKEND) != "selectolax"
+
+def analisar(html: str, backend=None, somente=None):
+    """
+    Faz o parse do HTML com o backend configurado (ou o informado). Com
+    `somente` (lista de nomes de tags), apenas essas tags entram na árvore.
+    """
+    backend = backend or BACKEND
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+
+        return NoLexbor(LexborHTMLParser(html).root)
+    if somente:
+        return BeautifulSoup(html, backend, parse_only=SoupStrainer(list(somente)))
+    return BeautifulSoup(html, backend)
+
+# --- Adaptador selectolax ---
+def _atende(valor, filtro, atributo):
+    """Compara um atributo com um filtro no estilo do BeautifulSoup."""
+    if filtro is True:
+        return valor is not None
+    if valor is None:
+        return False
+    if atributo == "class":
+        classes = valor.split()
+        filtros = filtro if isinstance(filtro, (list, tuple, set)) else [filtro]
+        return any(f in classes for f in filtros) or valor in filtros
+    if isinstance(filtro, (list, tuple, set)):
+        return valor in filtro
+    return valor == filtro
+
+class NoLexbor:
+    """Elemento do selectolax com a interface de Tag do BeautifulSoup usada pelos critérios."""
+
+    __slots__ = ("_no",)
+
+    def __init__(self, no):
+        self._no = no
+
+    @property
+    def name(self):
+        return self._no.tag
+
+    @property
+    def attrs(self):
+        return dict(self._no.attributes)
+
+    def get(self, chave, padrao=None):
+        valor = self._no.attributes.get(chave)
+        return padrao if valor is None else valor
+
+    def __getitem__(self, chave):
+        valor = self._no.attributes.get(chave)
+        if valor is None:
+            raise KeyError(chave)
+        return valor
+
+    def find_all(self, nome=None, attrs=None, **filtros):
+        filtros = dict(filtros)
+        if "class_" in filtros:
+            filtros["class"] = filtros.pop("class_")
+        filtros.update(attrs or {})
+
+        encontrados = []
+        seletor = ", ".join(nome) if isinstance(nome, (list, tuple)) else (nome or "*")
+        for no in self._no.css(seletor):
+            atributos = no.attributes
+            if all(_atende(atributos.get(chave), filtro, chave) for chave, filtro in filtros.items()):
+                encontrados.append(NoLexbor(no))
+        return encontrados
+
+    def find(self, nome=None, attrs=None, **filtros):
+        encontrados = self.find_all(nome, attrs, **filtros)
+        return encontrados[0] if encontrados else None
+
+    def _strings(self, strip):
+        for no in self._no.traverse(include_text=True):
+            if no.tag != "-text" or (no.parent is not None and no.parent.tag in _TAGS_SEM_TEXTO):
+                continue
+            texto = no.text_content or ""
+            if strip:
+                texto = texto.strip()
+                if not texto:
+                    continue
+            yield texto
+
+    @property
+    def stripped_strings(self):
+        return self._strings(strip=True)
+
+    def get_text(self, separator="", strip=False):
+        return separator.join(self._strings(strip))
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return self._no.html or ""
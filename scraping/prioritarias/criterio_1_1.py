@@ -10,13 +10,19 @@ ligado à administração pública (ex: .gov.br).
 
 from urllib.parse import urlparse
 
-def avaliar(html: str, soup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "1.1",
+    "descricao": "Possui sítio oficial próprio na internet?",
+    "fundamento": "Art. 8º, §1º, I, da Lei 12.527/2011",
+    "classificacao": "essencial",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "1.1",
-        "descricao": "Possui sítio oficial próprio na internet?",
-        "fundamento": "Art. 8º, §1º, I, da Lei 12.527/2011",
-        "classificacao": "essencial",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -26,7 +32,7 @@ def avaliar(html: str, soup, url: str) -> dict:
     }
 
     try:
-        dominio = urlparse(url).netloc
+        dominio = urlparse(pagina.url).netloc
         if dominio.endswith(".gov.br"):
             resultado["disponibilidade"] = True
             resultado["justificativa"] = f"Domínio identificado: {dominio}"
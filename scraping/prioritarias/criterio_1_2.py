@@ -7,13 +7,19 @@ Este critério será considerado atendido se a página inicial tiver um link vis
 apontando para o portal da transparência, com texto ou URL sugerindo essa finalidade.
 """
 
-def avaliar(html: str, soup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "1.2",
+    "descricao": "Possui portal da transparência próprio ou compartilhado?",
+    "fundamento": "Art. 8º, §1º, II, da Lei 12.527/2011",
+    "classificacao": "essencial",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "1.2",
-        "descricao": "Possui portal da transparência próprio ou compartilhado?",
-        "fundamento": "Art. 8º, §1º, II, da Lei 12.527/2011",
-        "classificacao": "essencial",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -23,11 +29,9 @@ def avaliar(html: str, soup, url: str) -> dict:
     }
 
     palavras_chave = ["transparência", "acesso à informação", "acessoainformacao"]
-    links = soup.find_all("a", href=True)
-
-    for link in links:
-        texto = link.get_text(strip=True).lower()
-        href = link['href'].lower()
+    for link in pagina.links:
+        texto = "".join(link.textos).lower()
+        href = link.href.lower()
         if any(p in texto or p in href for p in palavras_chave):
             resultado["disponibilidade"] = True
             resultado["justificativa"] = f"Link encontrado: texto='{texto}', href='{href}'"
@@ -7,13 +7,19 @@ Este critério será atendido se o link de transparência estiver em uma posiç
 como no menu principal ou cabeçalho da página.
 """
 
-def avaliar(html: str, soup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "1.3",
+    "descricao": "O acesso ao portal transparência está visível na capa do site?",
+    "fundamento": "Boas práticas PNTP",
+    "classificacao": "essencial",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "1.3",
-        "descricao": "O acesso ao portal transparência está visível na capa do site?",
-        "fundamento": "Boas práticas PNTP",
-        "classificacao": "essencial",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -22,7 +28,7 @@ def avaliar(html: str, soup, url: str) -> dict:
         "justificativa": ""
     }
 
-    header = soup.find('header') or soup.find('nav')
+    header = pagina.soup.find('header') or pagina.soup.find('nav')
     if header:
         links = header.find_all("a", href=True)
         for link in links:
@@ -7,13 +7,19 @@ Considera-se atendido se houver campo de busca (<input type='text'> ou similar)
 presente na página inicial ou em páginas do portal.
 """
 
-def avaliar(html: str, soup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "1.4",
+    "descricao": "O site e o portal contêm ferramenta de pesquisa de conteúdo?",
+    "fundamento": "Boas práticas PNTP",
+    "classificacao": "recomendado",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "1.4",
-        "descricao": "O site e o portal contêm ferramenta de pesquisa de conteúdo?",
-        "fundamento": "Boas práticas PNTP",
-        "classificacao": "recomendado",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": None,
         "serie_historica": None,
@@ -22,7 +28,7 @@ def avaliar(html: str, soup, url: str) -> dict:
         "justificativa": ""
     }
 
-    campos_busca = soup.find_all("input", {"type": ["text", "search"]})
+    campos_busca = [campo for campo in pagina.inputs if campo.get("type") in ("text", "search")]
     if campos_busca:
         resultado["disponibilidade"] = True
         resultado["justificativa"] = f"Encontrado(s) {len(campos_busca)} campo(s) de busca na página."
@@ -28,18 +28,22 @@ Filtro de Pesquisa:
 Deve permitir filtro por exercício (ano) e período (data ou mês).
 """
 
-import re
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from .. import contexto, memoria, paginas
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "3.1",
+    "descricao": "Divulga as receitas do Poder ou órgão, evidenciando sua previsão e realização?",
+    "fundamento": "Arts. 48, §1º, II e 48-A, II, da LC nº 101/00; Art. 8º, II, do Decreto nº 10.540/20",
+    "classificacao": "essencial",
+    "aplicavel_a": "Todos",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "3.1",
-        "descricao": "Divulga as receitas do Poder ou órgão, evidenciando sua previsão e realização?",
-        "fundamento": "Arts. 48, §1º, II e 48-A, II, da LC nº 101/00; Art. 8º, II, do Decreto nº 10.540/20",
-        "classificacao": "essencial",
-        "aplicavel_a": "Todos",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": False,
         "serie_historica": False,
@@ -48,34 +52,31 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": ""
     }
 
-    def analisar_contexto(soup_local, html_local) -> list:
+    def analisar_contexto(pagina_local) -> list:
         justificativas = []
-        texto = soup_local.get_text(separator=" ", strip=True).lower()
+        texto = pagina_local.texto_minusculo
 
         if any(p in texto for p in ["valor previsto", "valor arrecadado"]):
             resultado["disponibilidade"] = True
             justificativas.append("Colunas de valor previsto e arrecadado presentes.")
 
-        match_data = re.search(r"última atualização:\s*(\d{2}/\d{2}/\d{4})", html_local, re.IGNORECASE)
-        if match_data:
-            try:
-                data = datetime.strptime(match_data.group(1), "%d/%m/%Y")
-                if datetime.now() - data <= timedelta(days=30):
-                    resultado["atualidade"] = True
-                    justificativas.append(f"Atualizado em {match_data.group(1)}")
-                else:
-                    justificativas.append(f"Data desatualizada: {match_data.group(1)}")
-            except:
+        data = pagina_local.sinais.ultima_atualizacao_dois_pontos
+        if data:
+            if data.valor is None:
                 justificativas.append("Data encontrada, mas não pôde ser interpretada.")
-
-        anos = re.findall(r"\b(20[0-2][0-9])\b", html_local)
-        if len(set(anos)) >= 3:
+            elif datetime.now() - data.valor <= timedelta(days=30):
+                resultado["atualidade"] = True
+                justificativas.append(f"Atualizado em {data.texto}")
+            else:
+                justificativas.append(f"Data desatualizada: {data.texto}")
+
+        anos = pagina_local.sinais.anos
+        if len(anos) >= 3:
             resultado["serie_historica"] = True
-            justificativas.append(f"Série histórica com anos: {', '.join(sorted(set(anos)))}")
+            justificativas.append(f"Série histórica com anos: {', '.join(sorted(anos))}")
 
         formatos = ["pdf", "csv", "xls", "xlsx", "json", "xml"]
-        links = soup_local.find_all("a", href=True)
-        if any(any(fmt in a["href"].lower() for fmt in formatos) for a in links):
+        if pagina_local.sinais.exporta(formatos):
             resultado["gravacao"] = True
             justificativas.append("Exportação de relatórios disponível.")
 
@@ -86,18 +87,18 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         return justificativas
 
     # Primeiro: tentar na página original
-    justificativas = analisar_contexto(soup, html)
+    justificativas = analisar_contexto(pagina)
 
     # Se não encontrou o mínimo (previsão + realização), tenta iframe
     if not resultado["disponibilidade"]:
-        iframe = soup.find("iframe")
+        iframe = pagina.iframes[0] if pagina.iframes else None
         if iframe and "governotransparente.com.br" in iframe.get("src", ""):
             try:
-                res = requests.get(iframe["src"], timeout=20)
-                res.raise_for_status()
-                iframe_html = res.text
-                iframe_soup = BeautifulSoup(iframe_html, "html.parser")
-                justificativas = analisar_contexto(iframe_soup, iframe_html)
+                pagina_iframe = paginas.carregar_pagina(iframe["src"], timeout=20)
+                justificativas = analisar_contexto(pagina_iframe)
+            except (contexto.PrazoEsgotado, memoria.MemoriaExcedida):
+                # Prazo ou memória esgotados: o critério fica "não avaliado", não "indisponível"
+                raise
             except Exception as e:
                 justificativas.append(f"Erro ao acessar iframe: {e}")
         else:
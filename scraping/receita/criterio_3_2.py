@@ -27,17 +27,22 @@ Navegação entre os níveis da classificação (colapsos, setas, etc.).
 """
 
 import re
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from .. import contexto, memoria, paginas
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "3.2",
+    "descricao": "Divulga a classificacao orcamentaria por natureza da receita (categoria economica, origem, especie)?",
+    "fundamento": "Art. 8º, II, 'e', do Decreto nº 10.540/2020",
+    "classificacao": "essencial",
+    "aplicavel_a": "Executivo",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "3.2",
-        "descricao": "Divulga a classificacao orcamentaria por natureza da receita (categoria economica, origem, especie)?",
-        "fundamento": "Art. 8º, II, 'e', do Decreto nº 10.540/2020",
-        "classificacao": "essencial",
-        "aplicavel_a": "Executivo",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": False,
         "serie_historica": False,
@@ -46,9 +51,9 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
         "justificativa": ""
     }
 
-    def analisar_bloco(soup_local, html_local) -> list:
+    def analisar_bloco(pagina_local) -> list:
         justificativas = []
-        texto = soup_local.get_text(separator=" ", strip=True).lower()
+        texto = pagina_local.texto_minusculo
 
         # --- Classificacao por natureza (ex: 111250 + descricoes) ---
         if re.search(r"\b1{1,2}[0-9]{3,4}\b", texto) and any(p in texto for p in ["receitas correntes", "iptu", "impostos"]):
@@ -56,51 +61,48 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
             justificativas.append("Classificação por natureza da receita detectada (ex: 111250).")
 
         # --- Atualidade ---
-        match_data = re.search(r"última atualização:\s*(\d{2}/\d{2}/\d{4})", html_local, re.IGNORECASE)
-        if match_data:
-            try:
-                data = datetime.strptime(match_data.group(1), "%d/%m/%Y")
-                if datetime.now() - data <= timedelta(days=30):
-                    resultado["atualidade"] = True
-                    justificativas.append(f"Atualizado em {match_data.group(1)}")
-                else:
-                    justificativas.append(f"Desatualizado (data: {match_data.group(1)})")
-            except:
+        data = pagina_local.sinais.ultima_atualizacao_dois_pontos
+        if data:
+            if data.valor is None:
                 justificativas.append("Data presente mas não foi interpretada.")
+            elif datetime.now() - data.valor <= timedelta(days=30):
+                resultado["atualidade"] = True
+                justificativas.append(f"Atualizado em {data.texto}")
+            else:
+                justificativas.append(f"Desatualizado (data: {data.texto})")
 
         # --- Série histórica ---
-        anos = re.findall(r"\b(20[0-2][0-9])\b", html_local)
-        if len(set(anos)) >= 3:
+        anos = pagina_local.sinais.anos
+        if len(anos) >= 3:
             resultado["serie_historica"] = True
-            justificativas.append(f"Série histórica detectada: {', '.join(sorted(set(anos)))}")
+            justificativas.append(f"Série histórica detectada: {', '.join(sorted(anos))}")
 
         # --- Gravação ---
         formatos = ["csv", "xls", "xlsx", "json", "xml", "txt"]
-        links = soup_local.find_all("a", href=True)
-        if any(any(fmt in a["href"].lower() for fmt in formatos) for a in links):
+        if pagina_local.sinais.exporta(formatos):
             resultado["gravacao"] = True
             justificativas.append("Botões de exportação detectados.")
 
         # --- Navegabilidade/filtro estrutural ---
-        if any(icon in html_local for icon in ["fa-chevron-down", "fa-chevron-right", "expandir"]):
+        if any(icon in pagina_local.html for icon in ["fa-chevron-down", "fa-chevron-right", "expandir"]):
             resultado["filtro"] = True
             justificativas.append("Navegação entre níveis da classificação detectada.")
 
         return justificativas
 
     # Primeiro: analisa a página principal
-    justificativas = analisar_bloco(soup, html)
+    justificativas = analisar_bloco(pagina)
 
     # Se classificação não for encontrada, tenta iframe externo
     if not resultado["disponibilidade"]:
-        iframe = soup.find("iframe")
+        iframe = pagina.iframes[0] if pagina.iframes else None
         if iframe and "governotransparente.com.br" in iframe.get("src", ""):
             try:
-                res = requests.get(iframe["src"], timeout=20)
-                res.raise_for_status()
-                iframe_html = res.text
-                iframe_soup = BeautifulSoup(iframe_html, "html.parser")
-                justificativas = analisar_bloco(iframe_soup, iframe_html)
+                pagina_iframe = paginas.carregar_pagina(iframe["src"], timeout=20)
+                justificativas = analisar_bloco(pagina_iframe)
+            except (contexto.PrazoEsgotado, memoria.MemoriaExcedida):
+                # Prazo ou memória esgotados: o critério fica "não avaliado", não "indisponível"
+                raise
             except Exception as e:
                 justificativas.append(f"Erro ao carregar iframe: {e}")
         else:
@@ -26,17 +26,21 @@ Deve permitir filtro por nome e ano de inscrição em dívida ativa.
 """
 
 import re
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
-def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
+from ..paginas import Pagina
+
+METADADOS = {
+    "codigo": "3.3",
+    "descricao": "Divulga a lista dos inscritos em dívida ativa, contendo nome e valor total da dívida?",
+    "fundamento": "Art. 198, §3º, II da Lei 5.172/1966 (CTN)",
+    "classificacao": "obrigatória",
+    "aplicavel_a": "Executivo",
+}
+
+def avaliar(pagina: Pagina) -> dict:
     resultado = {
-        "codigo": "3.3",
-        "descricao": "Divulga a lista dos inscritos em dívida ativa, contendo nome e valor total da dívida?",
-        "fundamento": "Art. 198, §3º, II da Lei 5.172/1966 (CTN)",
-        "classificacao": "obrigatória",
-        "aplicavel_a": "Executivo",
+        **METADADOS,
         "disponibilidade": False,
         "atualidade": False,
         "serie_historica": False,
@@ -46,7 +50,7 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
     }
 
     justificativas = []
-    texto = soup.get_text(separator=" ", strip=True).lower()
+    texto = pagina.texto_minusculo
 
     # --- Nome + Valor ---
     if any(p in texto for p in ["nome", "valor", "dívida ativa"]):
@@ -55,33 +59,32 @@ def avaliar(html: str, soup: BeautifulSoup, url: str) -> dict:
             justificativas.append("Colunas de nome e valor da dívida identificadas.")
 
     # --- Atualidade ---
-    match_data = re.search(r"última atualização[:\s]+(\d{2}/\d{2}/\d{4})", html, re.IGNORECASE)
-    if match_data:
-        try:
-            data = datetime.strptime(match_data.group(1), "%d/%m/%Y")
-            if datetime.now() - data <= timedelta(days=365):
-                resultado["atualidade"] = True
-                justificativas.append(f"Atualizado em {match_data.group(1)}")
-            else:
-                justificativas.append(f"Data desatualizada: {match_data.group(1)}")
-        except:
+    data = pagina.sinais.ultima_atualizacao
+    if data:
+        if data.valor is None:
             justificativas.append("Data presente, mas não pôde ser interpretada.")
+        elif datetime.now() - data.valor <= timedelta(days=365):
+            resultado["atualidade"] = True
+            justificativas.append(f"Atualizado em {data.texto}")
+        else:
+            justificativas.append(f"Data desatualizada: {data.texto}")
 
     # --- Série histórica ---
-    anos = re.findall(r"\b(20[0-2][0-9])\b", html)
-    if len(set(anos)) >= 3:
+    anos = pagina.sinais.anos
+    if len(anos) >= 3:
         resultado["serie_historica"] = True
-        justificativas.append(f"Série histórica com anos: {', '.join(sorted(set(anos)))}")
+        justificativas.append(f"Série histórica com anos: {', '.join(sorted(anos))}")
 
     # --- Exportação ---
     formatos = ["csv", "xls", "xlsx", "json", "xml"]
-    links = soup.find_all("a", href=True)
-    if any(any(fmt in a["href"].lower() for fmt in formatos) for a in links):
+    if pagina.sinais.exporta(formatos):
         resultado["gravacao"] = True
         justificativas.append("Exportação da base detectada.")
 
     # --- Filtros ---
-    if any(t in texto for t in ["filtrar", "buscar", "nome", "ano"]):
+    # Só no conteúdo principal: "ano" e "buscar" aparecem em quase todo menu de portal
+    conteudo = pagina.texto_principal.lower()
+    if any(t in conteudo for t in ["filtrar", "buscar", "nome", "ano"]):
         resultado["filtro"] = True
         justificativas.append("Filtros de nome e/ou ano identificados.")
 
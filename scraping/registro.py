@@ -0,0 +1,192 @@
+"""
+Registro dos critérios avaliados em cada análise.
+
+Cada manager declara, na importação, os critérios do seu domínio: o código, a
+função `avaliar` e a página que o critério lê. A página é indicada por:
+- uma chave de grupo de links do domínio, registrada em `scraping.descoberta`
+  (ex.: "despesa_atual");
+- uma regra: função que recebe a página inicial e retorna a URL (ou None);
+- `INICIAL`: a própria página inicial.
+
+Quando a página alvo não é encontrada ou não carrega, o critério recebe a página
+de `fallback` (indicada da mesma forma; por padrão, a inicial). Critérios cujo
+resultado depende da data da avaliação (ex.: atualidade) declaram
+`depende_da_data=True`.
+
+A identificação do critério (código, descrição, fundamento, classificação e a
+quem se aplica) vem do dicionário `METADADOS` do módulo do critério, o mesmo que
+abre o resultado de `avaliar`. Assim um critério não avaliado (ver
+`scraping.execucao`) tem os mesmos campos de identificação de um avaliado.
+
+É o executor (`scraping.execucao`) que decide quais páginas baixar: critérios que
+apontam para a mesma página a compartilham, então registrar um critério novo
+nunca acrescenta um download repetido. A ordem de registro é a ordem dos
+resultados de cada domínio.
+
+O catálogo (`catalogo()`) é montado uma única vez por processo, na primeira
+chamada (a API o monta na inicialização): descobre os domínios (subpacotes com
+`manager.py`), importa os managers, compila o reconhecedor de links e valida os
+critérios. O resultado é imutável e reaproveitado por todas as análises; se algum
+manager for inválido, a montagem falha com `CatalogoInvalido` em vez de o
+problema aparecer durante uma análise.
+
+Versões: o catálogo guarda, para cada critério, um hash do código que decide o
+seu resultado (o módulo do critério, os módulos compartilhados de leitura da página
+e o parser em uso). Uma análise pode reaproveitar o resultado anterior de um
+critério só se a versão dele não mudou (ver `scraping.execucao`).
+"""
+
+import hashlib
+import importlib
+import sys
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, NamedTuple
+
+from scraping import descoberta
+
+INICIAL = None  # alvo (ou fallback) na página inicial
+
+class Criterio(NamedTuple):
+    codigo: str
+    dominio: str
+    avaliar: Callable
+    pagina: Any = INICIAL    # chave de grupo, regra (Pagina -> URL ou None) ou INICIAL
+    fallback: Any = INICIAL  # idem, usada quando a página alvo não existe ou falha
+    depende_da_data: bool = False  # o resultado muda com a data da avaliação, não só com as páginas
+    metadados: Any = MappingProxyType({})  # identificação do critério (ver CAMPOS_METADADOS)
+
+    @property
+    def descricao(self) -> str:
+        return self.metadados.get("descricao") or f"Critério {self.codigo}"
+
+# Campos de identificação que abrem o resultado de todo critério
+CAMPOS_METADADOS = ("codigo", "descricao", "fundamento", "classificacao", "aplicavel_a")
+
+_lock = threading.Lock()
+_criterios = {}  # codigo -> Criterio, na ordem de registro
+
+def registrar(codigo, dominio, avaliar, pagina=INICIAL, fallback=INICIAL, depende_da_data=False, metadados=None):
+    """
+    Registra (ou substitui) o critério `codigo` do domínio. `metadados`, se não
+    informado, é o `METADADOS` do módulo de `avaliar`.
+    """
+    if metadados is None:
+        metadados = getattr(sys.modules.get(getattr(avaliar, "__module__", "")), "METADADOS", {})
+    criterio = Criterio(codigo, dominio, avaliar, pagina, fallback, depende_da_data, MappingProxyType(dict(metadados)))
+    with _lock:
+        _criterios.pop(codigo, None)
+        _criterios[codigo] = criterio
+
+def criterios(dominios=None) -> list:
+    """Critérios registrados, na ordem de registro; só os dos `dominios`, se informados."""
+    with _lock:
+        todos = list(_criterios.values())
+    if dominios is None:
+        return todos
+    return [criterio for criterio in todos if criterio.dominio in dominios]
+
+# --- Catálogo ---
+
+class CatalogoInvalido(RuntimeError):
+    """Algum manager de domínio não pôde ser carregado ou declara critérios inválidos."""
+
+class Catalogo(NamedTuple):
+    """Domínios, managers e critérios validados, montados uma vez por processo."""
+    dominios: tuple      # em ordem alfabética (ordem de saída dos resultados)
+    managers: Any        # {dominio: módulo manager}, somente leitura
+    criterios: tuple     # Criterio, na ordem de registro
+    versoes: Any         # {codigo: hash do código que avalia o critério}, somente leitura
+
+    def criterios_de(self, dominios=None) -> list:
+        """Critérios dos `dominios` (todos, se None), na ordem de registro."""
+        if dominios is None:
+            return list(self.criterios)
+        return [criterio for criterio in self.criterios if criterio.dominio in dominios]
+
+_lock_catalogo = threading.Lock()
+_catalogo = None
+
+def listar_dominios():
+    """Lista os diretórios de domínio que contêm um manager.py"""
+    base_dir = Path(__file__).parent
+    return sorted(item.name for item in base_dir.iterdir() if item.is_dir() and (item / "manager.py").exists())
+
+def _validar(managers, criterios):
+    problemas = []
+    for dominio, manager in managers.items():
+        if not callable(getattr(manager, "avaliar", None)):
+            problemas.append(f"manager de '{dominio}' não possui função avaliar()")
+        if not any(criterio.dominio == dominio for criterio in criterios):
+            problemas.append(f"domínio '{dominio}' não registra nenhum critério")
+
+    grupos = descoberta.grupos()
+    for criterio in criterios:
+        if criterio.dominio not in managers:
+            problemas.append(f"critério {criterio.codigo}: domínio '{criterio.dominio}' sem manager")
+        if not callable(criterio.avaliar):
+            problemas.append(f"critério {criterio.codigo}: avaliar não é uma função")
+        faltando = [campo for campo in CAMPOS_METADADOS if not criterio.metadados.get(campo)]
+        if faltando:
+            problemas.append(f"critério {criterio.codigo}: METADADOS sem {', '.join(faltando)}")
+        elif criterio.metadados["codigo"] != criterio.codigo:
+            problemas.append(f"critério {criterio.codigo}: METADADOS com código {criterio.metadados['codigo']}")
+        for especificacao in (criterio.pagina, criterio.fallback):
+            if isinstance(especificacao, str) and (criterio.dominio, especificacao) not in grupos:
+                problemas.append(f"critério {criterio.codigo}: grupo de links '{especificacao}' não registrado")
+            elif especificacao is not INICIAL and not isinstance(especificacao, str) and not callable(especificacao):
+                problemas.append(f"critério {criterio.codigo}: página deve ser grupo, regra ou INICIAL")
+    return problemas
+
+# Módulos que, além do próprio critério, decidem o que ele lê na página
+MODULOS_BASE = ("paginas", "sinais", "conteudo", "sanitizacao", "decodificacao", "parsers")
+
+def _fonte(modulo) -> bytes:
+    try:
+        return Path(modulo.__file__).read_bytes()
+    except (AttributeError, TypeError, OSError):
+        return repr(modulo).encode()
+
+def _versoes(criterios) -> dict:
+    from scraping import parsers
+    base = hashlib.sha256(parsers.BACKEND.encode())
+    for nome in MODULOS_BASE:
+        base.update(_fonte(importlib.import_module(f"scraping.{nome}")))
+
+    versoes = {}
+    for criterio in criterios:
+        versao = base.copy()
+        versao.update(_fonte(sys.modules.get(getattr(criterio.avaliar, "__module__", ""))))
+        versoes[criterio.codigo] = versao.hexdigest()
+    return versoes
+
+def construir() -> Catalogo:
+    """Descobre, importa e valida os domínios; levanta `CatalogoInvalido` se houver problemas."""
+    managers, problemas = {}, []
+    for dominio in listar_dominios():
+        try:
+            managers[dominio] = importlib.import_module(f"scraping.{dominio}.manager")
+        except Exception as e:
+            problemas.append(f"não foi possível importar o manager de '{dominio}': {e}")
+
+    todos = criterios()
+    problemas += _validar(managers, todos)
+    if problemas:
+        raise CatalogoInvalido("[ERRO] Catálogo de critérios inválido: " + "; ".join(problemas))
+
+    descoberta.compilar()
+    return Catalogo(
+        dominios=tuple(sorted(managers)),
+        managers=MappingProxyType(managers),
+        criterios=tuple(todos),
+        versoes=MappingProxyType(_versoes(todos)),
+    )
+
+def catalogo() -> Catalogo:
+    """O catálogo do processo, montado na primeira chamada."""
+    global _catalogo
+    with _lock_catalogo:
+        if _catalogo is None:
+            _catalogo = construir()
+        return _catalogo
@@ -0,0 +1,186 @@
+"""
+Gravação e reprodução das respostas HTTP de uma análise.
+
+No modo de gravação, toda resposta obtida por `fetcher.baixar` (URL, status,
+cabeçalhos e corpo, ou a falha ocorrida) é guardada num acervo: um arquivo zip
+com um índice JSON e os corpos deduplicados pelo hash. No modo de reprodução, o
+acervo é servido no lugar da rede, o que permite medir o desempenho do parse e
+dos critérios de forma reprodutível numa máquina sem acesso aos portais.
+
+Enquanto um acervo está ativo, o cache persistente é ignorado, para que a
+gravação capture todas as páginas; na reprodução também não há agendamento por
+host nem cache negativo, de modo que o resultado não dependa de estado externo.
+
+Uso:
+    python -m scraping.reproducao gravar <url> <acervo.zip>
+    python -m scraping.reproducao medir <acervo.zip> [repeticoes]
+
+Configuração (variáveis de ambiente):
+- SCRAPING_GRAVAR_DIR: se definido, cada análise executada grava um acervo neste diretório
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from urllib.parse import urldefrag, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+GRAVAR_DIR = os.getenv("SCRAPING_GRAVAR_DIR")
+
+_acervo_atual = contextvars.ContextVar("acervo_atual", default=None)
+
+class Acervo:
+    """Respostas gravadas de uma análise, indexadas pela URL requisitada."""
+
+    def __init__(self, url_analise=None, modo="gravar"):
+        self.url_analise = url_analise
+        self.modo = modo
+        self._respostas = {}
+        self._corpos = {}
+        self._lock = threading.Lock()
+
+    @property
+    def reproduzindo(self):
+        return self.modo == "reproduzir"
+
+    def registrar(self, url, resposta=None, erro=None):
+        """Grava a resposta (fetcher.Resposta) ou a exceção obtida para a URL."""
+        if resposta is not None:
+            hash_corpo = hashlib.sha256(resposta.corpo).hexdigest()
+            registro = {
+                "url_final": resposta.url,
+                "status": resposta.status,
+                "cabecalhos": dict(resposta.cabecalhos),
+                "corpo": hash_corpo,
+                "truncada": resposta.truncada,
+            }
+        else:
+            hash_corpo = None
+            registro = {"erro": type(erro).__name__, "mensagem": str(erro)}
+        with self._lock:
+            if hash_corpo is not None:
+                self._corpos[hash_corpo] = resposta.corpo
+            self._respostas[urldefrag(url)[0]] = registro
+
+    def reproduzir(self, url):
+        """Retorna a resposta gravada para a URL ou levanta a falha gravada."""
+        # Import tardio: fetcher depende deste módulo
+        from scraping.fetcher import ConteudoNaoSuportado, Resposta
+
+        registro = self._respostas.get(urldefrag(url)[0])
+        if registro is None:
+            raise requests.ConnectionError(f"URL não gravada no acervo: {url}")
+        if "erro" in registro:
+            excecoes = {
+                "ConteudoNaoSuportado": ConteudoNaoSuportado,
+                "HTTPError": requests.HTTPError,
+                "Timeout": requests.Timeout,
+                "ReadTimeout": requests.Timeout,
+                "ConnectTimeout": requests.Timeout,
+            }
+            raise excecoes.get(registro["erro"], requests.ConnectionError)(registro["mensagem"])
+        return Resposta(
+            registro["url_final"],
+            registro["status"],
+            CaseInsensitiveDict(registro["cabecalhos"]),
+            self._corpos[registro["corpo"]],
+            registro["truncada"],
+        )
+
+    def salvar(self, caminho):
+        with self._lock:
+            indice = {"url": self.url_analise, "respostas": self._respostas}
+            with zipfile.ZipFile(caminho, "w", compression=zipfile.ZIP_DEFLATED) as arquivo:
+                arquivo.writestr("indice.json", json.dumps(indice, ensure_ascii=False))
+                for hash_corpo, corpo in self._corpos.items():
+                    arquivo.writestr(f"corpos/{hash_corpo}", corpo)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with zipfile.ZipFile(caminho) as arquivo:
+            indice = json.loads(arquivo.read("indice.json"))
+            acervo = cls(indice.get("url"), modo="reproduzir")
+            acervo._respostas = indice["respostas"]
+            for registro in acervo._respostas.values():
+                if "corpo" in registro:
+                    acervo._corpos[registro["corpo"]] = arquivo.read(f"corpos/{registro['corpo']}")
+        return acervo
+
+def atual():
+    """Acervo ativo no contexto atual, ou None."""
+    return _acervo_atual.get()
+
+@contextmanager
+def gravando(caminho, url_analise=None):
+    """Grava em `caminho` todas as respostas obtidas durante o bloco `with`."""
+    acervo = Acervo(url_analise, modo="gravar")
+    token = _acervo_atual.set(acervo)
+    try:
+        yield acervo
+    finally:
+        _acervo_atual.reset(token)
+        acervo.salvar(caminho)
+
+@contextmanager
+def reproduzindo(caminho):
+    """Serve as respostas do acervo em `caminho` no lugar da rede durante o bloco `with`."""
+    acervo = Acervo.carregar(caminho)
+    token = _acervo_atual.set(acervo)
+    try:
+        yield acervo
+    finally:
+        _acervo_atual.reset(token)
+
+def caminho_gravacao(url):
+    """Caminho do acervo a gravar para uma análise, quando SCRAPING_GRAVAR_DIR está definido."""
+    if not GRAVAR_DIR:
+        return None
+    os.makedirs(GRAVAR_DIR, exist_ok=True)
+    host = (urlsplit(url).hostname or "portal").replace(":", "_")
+    return os.path.join(GRAVAR_DIR, f"{host}-{time.strftime('%Y%m%d-%H%M%S')}.zip")
+
+# --- Linha de comando ---
+def _medir(caminho, repeticoes):
+    from scraping import scraper
+
+    acervo = Acervo.carregar(caminho)
+    tempos = []
+    criterios = 0
+    for _ in range(repeticoes):
+        with reproduzindo(caminho):
+            inicio = time.perf_counter()
+            resultado = scraper.executar_scraping(acervo.url_analise)
+            tempos.append(time.perf_counter() - inicio)
+        criterios = sum(len(itens) for itens in resultado["dominios"].values())
+
+    media = sum(tempos) / len(tempos)
+    print(f"Acervo: {caminho} ({len(acervo._respostas)} respostas)")
+    print(f"Repetições: {repeticoes} | média: {media * 1000:.1f} ms | mínimo: {min(tempos) * 1000:.1f} ms")
+    print(f"Critérios por segundo: {criterios / media:.1f}")
+
+def main(argv):
+    if len(argv) >= 3 and argv[0] == "gravar":
+        from scraping import scraper
+
+        with gravando(argv[2], url_analise=argv[1]):
+            scraper.executar_scraping(argv[1])
+        print(f"Acervo gravado em {argv[2]}")
+    elif len(argv) >= 2 and argv[0] == "medir":
+        _medir(argv[1], int(argv[2]) if len(argv) > 2 else 10)
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    # Executa pela instância importada do módulo, a mesma consultada pelo fetcher
+    from scraping.reproducao import main as _main
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,125 @@
+"""
+Limpeza do HTML antes do parse.
+
+Portais municipais costumam embutir grandes pacotes de <script>, blocos <style>,
+ícones SVG e imagens em data-URI (base64). Nada disso é lido pelos critérios pelo
+DOM (o texto visível já ignora script e style), mas o parser precisa percorrer e
+montar tudo. Aqui esses trechos são retirados do HTML entregue ao parser:
+
+- conteúdo de <script> e <style> (as tags ficam, vazias);
+- geometria dos SVG (<path>, <circle>, <g>, ...), preservando textos, títulos e
+  links dentro do SVG;
+- dados de data-URIs em atributos e em url(...), preservando o tipo (ex.:
+  "data:application/pdf;base64,").
+
+O HTML original continua em `Pagina.html`, para os critérios que leem o HTML bruto.
+Além disso, o documento entregue ao parser é cortado a partir da N-ésima tag,
+limitando a quantidade de nós da árvore.
+
+Configuração (variáveis de ambiente):
+- SCRAPING_SANITIZAR: "0" entrega o HTML original ao parser (padrão "1")
+- SCRAPING_MAX_NOS: máximo de tags entregues ao parser; 0 desativa (padrão 100000)
+"""
+
+import os
+import re
+from itertools import islice
+
+from scraping import contexto
+
+SANITIZAR = os.getenv("SCRAPING_SANITIZAR", "1") != "0"
+MAX_NOS = int(os.getenv("SCRAPING_MAX_NOS", 100000))
+
+# Os padrões evitam IGNORECASE e laços preguiçosos (.*?): começando por um literal
+# ("<", "data:"), o `re` salta direto às ocorrências em vez de testar cada posição,
+# e o conteúdo é consumido em blocos sem "<" (laço desenrolado)
+
+def _sem_caixa(palavra):
+    return "".join(f"[{c.lower()}{c.upper()}]" for c in palavra)
+
+def _padrao_elemento(tag):
+    """(abertura)(conteúdo)(fechamento) de um elemento cujo conteúdo vai até o primeiro </tag>."""
+    tag = _sem_caixa(tag)
+    return re.compile(rf"(<{tag}\b[^>]*>)([^<]*(?:<(?!/{tag}\s*>)[^<]*)*)(</{tag}\s*>)")
+
+# Mesma regra do tokenizador HTML: o conteúdo vai até o primeiro </script> (ou </style>)
+_PADROES_SCRIPT_STYLE = (_padrao_elemento("script"), _padrao_elemento("style"))
+_PADRAO_SVG = _padrao_elemento("svg")
+_PADRAO_GEOMETRIA_SVG = re.compile(
+    r"</?(?:path|g|circle|ellipse|line|polyline|polygon|rect|use|defs|symbol|stop|"
+    r"lineargradient|radialgradient|clippath|mask|pattern|filter|fe\w+)\b[^>]*>",
+    re.IGNORECASE,
+)
+# Início de um data-URI em valor de atributo ou url(...): o lookbehind confere o
+# caractere anterior depois de achado o literal "data:"
+_PADRAO_INICIO_DATA_URI = re.compile(r"data:(?<=[=\"'(]data:)[^,\"'\s)>]*,")
+_PADRAO_FIM_SEM_ASPAS = re.compile(r"[\s\"'>)]")
+_FECHAMENTOS = {'"': '"', "'": "'", "(": ")"}
+# Cargas menores que isto não compensam o corte
+MIN_CARGA_DATA_URI = 64
+_PADRAO_TAG = re.compile(r"<[a-zA-Z]")
+
+def _bytes_removidos(html, limpo):
+    if html.isascii():  # consulta O(1): em ASCII, caracteres e bytes coincidem
+        return len(html) - len(limpo)
+    return len(html.encode("utf-8", "surrogatepass")) - len(limpo.encode("utf-8", "surrogatepass"))
+
+def _esvaziar(match):
+    return match.group(1) + match.group(3)
+
+def _limpar_svg(match):
+    return _PADRAO_GEOMETRIA_SVG.sub("", match.group(0))
+
+def _remover_dados(html):
+    """Retira a carga dos data-URIs, mantendo o prefixo (ex.: "data:image/png;base64,")."""
+    partes = []
+    copiado = 0
+    posicao = 0
+    while True:
+        match = _PADRAO_INICIO_DATA_URI.search(html, posicao)
+        if match is None:
+            break
+        fechamento = _FECHAMENTOS.get(html[match.start() - 1])
+        if fechamento is not None:
+            fim = html.find(fechamento, match.end())
+        else:
+            delimitador = _PADRAO_FIM_SEM_ASPAS.search(html, match.end())
+            fim = delimitador.start() if delimitador else -1
+        if fim < 0:
+            fim = len(html)
+        if fim - match.end() >= MIN_CARGA_DATA_URI:
+            partes.append(html[copiado:match.end()])
+            copiado = fim
+        posicao = fim
+    if not partes:
+        return html
+    partes.append(html[copiado:])
+    return "".join(partes)
+
+def _limitar_nos(html, maximo):
+    """Corta o HTML no início da tag seguinte à `maximo`-ésima; retorna (html, cortado)."""
+    excedente = next(islice(_PADRAO_TAG.finditer(html), maximo, None), None)
+    if excedente is None:
+        return html, False
+    return html[:excedente.start()], True
+
+def sanitizar(html: str, url: str = "") -> str:
+    """Retorna o HTML a ser entregue ao parser, registrando nas métricas o que foi retirado."""
+    if not SANITIZAR:
+        return html
+
+    limpo = html
+    for padrao in _PADROES_SCRIPT_STYLE:
+        limpo = padrao.sub(_esvaziar, limpo)
+    limpo = _PADRAO_SVG.sub(_limpar_svg, limpo)
+    limpo = _remover_dados(limpo)
+
+    if MAX_NOS > 0:
+        limpo, cortado = _limitar_nos(limpo, MAX_NOS)
+        if cortado:
+            contexto.contar("paginas_nos_limitados")
+            print(f"[AVISO] Página {url} com mais de {MAX_NOS} tags: o restante não foi analisado.")
+
+    if len(limpo) != len(html):
+        contexto.contar("sanitizacao_bytes_removidos", _bytes_removidos(html, limpo))
+    return limpo
@@ -2,57 +2,72 @@
 
 import sys
 from pathlib import Path
-from bs4 import BeautifulSoup
-import requests
 from urllib.parse import urlparse
 
 # Adiciona a raiz do projeto ao sys.path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+from scraping import antecipacao, contexto, execucao, memoria, paginas, registro, reproducao
+
 def carregar_html(url):
-    """Faz download do HTML da página e retorna o HTML bruto e o objeto BeautifulSoup."""
+    """
+    Faz download da página inicial e retorna sua `Pagina` (HTML bruto, soup e características).
+    Durante o download, as subpáginas já reconhecidas começam a ser baixadas (ver `antecipacao`).
+    """
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        html = response.text
-        soup = BeautifulSoup(html, 'html.parser')
-        return html, soup
+        return paginas.carregar_pagina(url, timeout=15, ao_receber=antecipacao.consumidor(url))
+    except (contexto.PrazoEsgotado, memoria.MemoriaExcedida):
+        # Desfechos da análise, não falhas da URL: tratados por quem chamou (ver main.py)
+        raise
     except Exception as e:
         raise RuntimeError(f"[ERRO] Não foi possível carregar a URL: {e}")
 
-def listar_dominios():
-    """Lista os diretórios de domínio que contêm um manager.py"""
-    base_dir = Path(__file__).parent
-    dominios = []
-    for item in base_dir.iterdir():
-        if item.is_dir() and (item / 'manager.py').exists():
-            dominios.append(item.name)
-    return dominios
-
-def importar_manager(dominio_nome):
-    """Importa dinamicamente o módulo manager de um domínio"""
-    try:
-        return __import__(f"scraping.{dominio_nome}.manager", fromlist=['avaliar'])
-    except ImportError as e:
-        print(f"[ERRO] Não foi possível importar o manager de {dominio_nome}: {e}")
-        return None
-
-def executar_scraping(url: str) -> dict:
-    """Executa o scraping para todos os domínios encontrados."""
-    html, soup = carregar_html(url)
-    dominios = listar_dominios()
-
-    resultado_final = {"urlAvaliada": url, "dominios": {}}
-
-    for dominio in dominios:
-        manager = importar_manager(dominio)
-        if manager and hasattr(manager, 'avaliar'):
-            try:
-                resultados = manager.avaliar(html, soup, url)
-                resultado_final["dominios"][dominio] = resultados
-            except Exception as e:
-                print(f"[ERRO] ao avaliar domínio '{dominio}': {e}")
-        else:
-            print(f"[AVISO] Manager de '{dominio}' não possui função avaliar().")
+def preparar():
+    """
+    Monta o catálogo de critérios (ver `registro.catalogo`). Chamado na inicialização
+    da API: falha logo se algum manager for inválido.
+    """
+    return registro.catalogo()
+
+def executar_scraping(url: str, prazo: float = None, anteriores: dict = None, ao_avaliar=None) -> dict:
+    """
+    Executa o scraping de todos os critérios do catálogo.
+
+    `prazo`: segundos para a análise inteira (None usa SCRAPING_PRAZO_ANALISE). Os
+    critérios que não couberem no prazo voltam marcados com "avaliado": False.
+    `anteriores`: resultados da última análise da URL, {codigo: resultado}; os critérios
+    cujo código e páginas não mudaram não são reavaliados (ver `execucao.executar`).
+    `ao_avaliar(dominio, resultado)`: chamada a cada critério concluído, antes do fim da análise.
+    """
+    caminho_acervo = reproducao.caminho_gravacao(url) if reproducao.atual() is None else None
+    if caminho_acervo:
+        with reproducao.gravando(caminho_acervo, url_analise=url):
+            return _executar_scraping(url, prazo, anteriores, ao_avaliar)
+    return _executar_scraping(url, prazo, anteriores, ao_avaliar)
+
+def _executar_scraping(url, prazo=None, anteriores=None, ao_avaliar=None):
+    # O catálogo é montado antes do download: é ao importar os managers que eles
+    # registram os links que procuram, usados para antecipar as subpáginas
+    catalogo = registro.catalogo()
+
+    with contexto.iniciar_analise(url, prazo) as analise:
+        pagina = carregar_html(url)
+        analise.pagina_inicial = pagina
+
+        resultado_final = {"urlAvaliada": url, "dominios": {}}
+
+        resultados = execucao.executar(
+            pagina, catalogo=catalogo, anteriores=anteriores,
+            ao_avaliar=(lambda criterio, resultado: ao_avaliar(criterio.dominio, resultado)) if ao_avaliar else None,
+        )
+        # Etapas que tratam erros localmente (ex.: subpáginas) podem ter engolido o aviso
+        memoria.verificar()
+
+        # A ordem de saída segue a dos domínios do catálogo, não a ordem de conclusão
+        for dominio in catalogo.dominios:
+            if dominio in resultados:
+                resultado_final["dominios"][dominio] = resultados[dominio]
+
+        resultado_final["metricas"] = analise.metricas()
 
     return resultado_final
@@ -0,0 +1,83 @@
+"""
+Sinais temporais e de exportação extraídos das páginas.
+
+Os critérios fiscais (3.x e 4.x) procuram sempre os mesmos sinais no HTML bruto:
+a data de "última atualização", os anos citados (série histórica) e os links de
+exportação por formato. Aqui os padrões são compilados uma única vez e cada sinal
+é extraído no primeiro acesso e memorizado na página (`pagina.sinais`), em vez de
+cada critério varrer de novo o HTML inteiro.
+"""
+
+import re
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from scraping import concorrencia
+
+FORMATOS_EXPORTACAO = ("pdf", "csv", "xls", "xlsx", "json", "xml", "txt")
+
+# O separador é capturado para distinguir "última atualização: dd/mm/aaaa" (3.1 e
+# 3.2 exigem os dois-pontos) de "última atualização dd/mm/aaaa" (demais critérios)
+_PADRAO_ATUALIZACAO = re.compile(r"última atualização([:\s]+)(\d{2}/\d{2}/\d{4})", re.IGNORECASE)
+_PADRAO_SEPARADOR_DOIS_PONTOS = re.compile(r":\s*")
+_PADRAO_ANO = re.compile(r"\b(20[0-2][0-9])\b")
+_PADRAO_DATA = re.compile(r"\b(\d{2}/\d{2}/\d{4})\b")
+
+class Data(NamedTuple):
+    texto: str                  # como aparece na página (dd/mm/aaaa)
+    valor: Optional[datetime]   # None se não for uma data válida
+
+def _data(texto):
+    try:
+        return Data(texto, datetime.strptime(texto, "%d/%m/%Y"))
+    except ValueError:
+        return Data(texto, None)
+
+class Sinais:
+    """Sinais de uma página, extraídos sob demanda e memorizados."""
+
+    def __init__(self, pagina):
+        self._pagina = pagina
+        self._lock = pagina._lock
+
+    @concorrencia.memorizada
+    def _atualizacoes(self):
+        """(primeira data de atualização, primeira com dois-pontos) no HTML."""
+        qualquer = dois_pontos = None
+        for match in _PADRAO_ATUALIZACAO.finditer(self._pagina.html):
+            if qualquer is None:
+                qualquer = _data(match.group(2))
+            if _PADRAO_SEPARADOR_DOIS_PONTOS.fullmatch(match.group(1)):
+                dois_pontos = _data(match.group(2))
+                break
+        return qualquer, dois_pontos
+
+    @property
+    def ultima_atualizacao(self) -> Optional[Data]:
+        """Data de "última atualização" no HTML, com ':' e/ou espaços antes da data."""
+        return self._atualizacoes[0]
+
+    @property
+    def ultima_atualizacao_dois_pontos(self) -> Optional[Data]:
+        """Data de "última atualização:" no HTML (dois-pontos obrigatório)."""
+        return self._atualizacoes[1]
+
+    @concorrencia.memorizada
+    def anos(self) -> frozenset:
+        """Anos de 2000 a 2029 citados no HTML, como texto."""
+        return frozenset(_PADRAO_ANO.findall(self._pagina.html))
+
+    @concorrencia.memorizada
+    def exportacao(self) -> dict:
+        """{formato: [hrefs]} dos links cujo href contém o formato (ex.: "csv")."""
+        hrefs = [link.href.lower() for link in self._pagina.links]
+        return {formato: [href for href in hrefs if formato in href] for formato in FORMATOS_EXPORTACAO}
+
+    def exporta(self, formatos) -> bool:
+        """Se há link de exportação em algum dos formatos."""
+        return any(self.exportacao.get(formato) for formato in formatos)
+
+    @concorrencia.memorizada
+    def datas(self) -> list:
+        """Datas dd/mm/aaaa citadas no texto visível, na ordem em que aparecem."""
+        return [_data(texto) for texto in _PADRAO_DATA.findall(self._pagina.texto)]
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
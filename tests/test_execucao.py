@@ -0,0 +1,79 @@
+"""
+Análise incremental (ver `scraping.execucao`): um resultado anterior só é
+reaproveitado se nenhuma página de que ele depende mudou, inclusive a página
+inicial, de onde `scraping.conteudo` tira o modelo do portal.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from scraping import contexto, execucao, paginas, registro
+
+URL_INICIAL = "https://www.exemplo.ce.gov.br/"
+URL_DIVIDA = "https://www.exemplo.ce.gov.br/divida-ativa"
+
+MENU = "<div>Buscar por nome ou ano em todo o portal da transparência</div>"
+DIVIDA = f"""<html><body>{MENU}
+<table><tr><td>Contribuinte</td><td>Inscrição</td></tr>
+<tr><td>Maria da Silva</td><td>R$ 1.200,00</td></tr></table>
+</body></html>"""
+
+def _inicial(com_menu):
+    return f"<html><body>{MENU if com_menu else ''}<p>Prefeitura Municipal</p></body></html>"
+
+@pytest.fixture
+def criterio_3_3():
+    catalogo = registro.catalogo()
+    criterio = next(criterio for criterio in catalogo.criterios if criterio.codigo == "3.3")
+    return criterio, catalogo.versoes["3.3"]
+
+def _avaliar(monkeypatch, html_inicial, criterio, versao, anteriores):
+    """Avalia o critério sobre a página da dívida numa análise com a página inicial informada."""
+    with contexto.iniciar_analise(URL_INICIAL, prazo=0) as analise:
+        inicial = paginas.Pagina(URL_INICIAL, html_inicial)
+        analise.pagina_inicial = inicial
+        carregadas = {URL_INICIAL: inicial, URL_DIVIDA: paginas.Pagina(URL_DIVIDA, DIVIDA)}
+        monkeypatch.setattr(paginas, "carregar_pagina", lambda url, **_: carregadas[url])
+        [(_, resultado)] = execucao._avaliar_grupo(
+            URL_DIVIDA, [(criterio, None)], {URL_DIVIDA: 15}, inicial, {criterio.codigo: versao}, anteriores,
+        )
+    return resultado
+
+def _anterior(resultado):
+    campos = {chave: valor for chave, valor in resultado.items() if chave not in execucao.CAMPOS_INCREMENTAIS}
+    return {
+        "resultado": campos,
+        "versao_criterio": resultado["versao_criterio"],
+        "paginas_entrada": resultado["paginas_entrada"],
+        "data_analise": datetime.utcnow(),
+    }
+
+def test_pagina_inicial_entra_nas_paginas_de_entrada(monkeypatch, criterio_3_3):
+    criterio, versao = criterio_3_3
+    resultado = _avaliar(monkeypatch, _inicial(com_menu=True), criterio, versao, {})
+    assert [url for url, _ in resultado["paginas_entrada"]] == [URL_DIVIDA, URL_INICIAL]
+
+def test_reaproveita_se_nada_mudou(monkeypatch, criterio_3_3):
+    criterio, versao = criterio_3_3
+    anterior = _avaliar(monkeypatch, _inicial(com_menu=True), criterio, versao, {})
+    resultado = _avaliar(monkeypatch, _inicial(com_menu=True), criterio, versao, {"3.3": _anterior(anterior)})
+    assert resultado.get("reaproveitado")
+
+def test_reavalia_se_so_a_pagina_inicial_mudou(monkeypatch, criterio_3_3):
+    criterio, versao = criterio_3_3
+    anterior = _avaliar(monkeypatch, _inicial(com_menu=True), criterio, versao, {})
+    # Com o menu no modelo do portal, "buscar"/"nome"/"ano" não contam como filtro
+    assert anterior["filtro"] is False
+
+    resultado = _avaliar(monkeypatch, _inicial(com_menu=False), criterio, versao, {"3.3": _anterior(anterior)})
+    assert not resultado.get("reaproveitado")
+    assert resultado["filtro"] is True
+
+@pytest.mark.parametrize("criterio", registro.catalogo().criterios, ids=lambda criterio: criterio.codigo)
+def test_nao_avaliado_tem_os_campos_de_um_avaliado(criterio):
+    avaliado = criterio.avaliar(paginas.Pagina(URL_INICIAL, "<html><body></body></html>"))
+    nao_avaliado = execucao.nao_avaliado(criterio)
+    assert set(nao_avaliado) == set(avaliado) | {"avaliado", *execucao.CAMPOS_INCREMENTAIS}
+    for campo in registro.CAMPOS_METADADOS:
+        assert nao_avaliado[campo] == avaliado[campo]
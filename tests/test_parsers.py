@@ -0,0 +1,81 @@
+"""
+Conformidade dos backends de parse (ver `scraping.parsers`): cada critério do
+catálogo deve dar exatamente o mesmo resultado com "html.parser", "lxml" e
+selectolax, com e sem o parse parcial de navegação.
+
+As páginas vêm de tests/fixtures: a de um portal municipal, com o HTML
+irregular comum nesses portais (tags sem fechamento, tabelas aninhadas,
+entidades, scripts e SVG), e a do iframe de receitas que os critérios 3.1 e 3.2
+seguem.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from scraping import paginas, parsers, registro
+
+FIXTURES = Path(__file__).parent / "fixtures"
+URL_PORTAL = "https://www.exemplo.ce.gov.br/"
+URL_IFRAME = "https://exemplo.governotransparente.com.br/receitas"
+
+def _ler(nome):
+    return (FIXTURES / nome).read_text(encoding="utf-8")
+
+def _avaliar_catalogo(monkeypatch, backend, parse_parcial):
+    """{codigo: resultado} de todos os critérios sobre a página do portal."""
+    if not parsers._backend_disponivel(backend):
+        pytest.skip(f"backend '{backend}' não instalado")
+    monkeypatch.setattr(parsers, "BACKEND", backend)
+    monkeypatch.setattr(paginas, "PARSE_PARCIAL", parse_parcial)
+    # O iframe seguido pelos critérios de receita vem da fixture, sem rede
+    iframes = {URL_IFRAME: _ler("iframe_receitas.html")}
+    monkeypatch.setattr(paginas, "carregar_pagina", lambda url, **_: paginas.Pagina(url, iframes[url]))
+
+    resultados = {}
+    for criterio in registro.catalogo().criterios:
+        # Página nova a cada critério: nada calculado por um backend é reaproveitado
+        pagina = paginas.Pagina(URL_PORTAL, _ler("portal_municipal.html"))
+        resultados[criterio.codigo] = paginas.avaliar_criterio(criterio.avaliar, pagina)
+    return resultados
+
+@pytest.fixture(scope="module")
+def referencia():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        return _avaliar_catalogo(monkeypatch, "html.parser", parse_parcial=False)
+
+# Critérios que leem a árvore (links, campos, iframes, find_all): a fixture foi
+# montada para que encontrem o que procuram, senão a comparação não provaria nada
+CRITERIOS_DE_ARVORE = ("1.2", "1.3", "1.4", "2.6", "2.7", "2.8", "2.9", "3.1", "3.2")
+
+def test_fixture_exercita_os_criterios(referencia):
+    assert len(referencia) == len(registro.catalogo().criterios)
+    for codigo in CRITERIOS_DE_ARVORE:
+        assert referencia[codigo]["disponibilidade"], f"critério {codigo} não encontrou nada na fixture"
+
+@pytest.mark.parametrize("parse_parcial", [False, True], ids=["arvore_completa", "parse_parcial"])
+@pytest.mark.parametrize("backend", parsers.BACKENDS)
+def test_criterios_iguais_em_todos_os_backends(monkeypatch, referencia, backend, parse_parcial):
+    resultados = _avaliar_catalogo(monkeypatch, backend, parse_parcial)
+    for codigo, esperado in referencia.items():
+        assert resultados[codigo] == esperado, f"critério {codigo} difere com o backend '{backend}'"
+
+def test_operacoes_dos_criterios(monkeypatch):
+    """As operações de árvore que os critérios usam devolvem o mesmo em todos os backends."""
+    html = _ler("portal_municipal.html")
+    vistos = {}
+    for backend in parsers.BACKENDS:
+        if not parsers._backend_disponivel(backend):
+            continue
+        soup = parsers.analisar(html, backend=backend)
+        vistos[backend] = (
+            [(a["href"], list(a.stripped_strings)) for a in soup.find_all("a", href=True)],
+            soup.get_text(separator=" ", strip=True),
+            soup.find("iframe")["src"],
+            [(campo.get("type"), campo.get("name")) for campo in soup.find_all("input")],
+            [div.get_text(strip=True) for div in soup.find_all("div", class_="resposta")],
+            soup.find("header").find_all("a", href=True)[1]["href"],
+        )
+    referencia = vistos.pop("html.parser")
+    for backend, operacoes in vistos.items():
+        assert operacoes == referencia, backend